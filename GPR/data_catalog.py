@@ -0,0 +1,286 @@
+'''
+One place to load the repo's shared inputs: course geometry, Broadie benchmarks and cleaned shots.
+
+Parsed results are memoised in-process and pickled to an on-disk cache keyed by (path, mtime, size),
+so e.g. the WKT in golf_holes_full.csv is parsed once per machine instead of once per script run.
+Editing or replacing a source file changes its key, so stale entries are never served.
+
+Usage (from any script that has GPR/ on sys.path):
+    import data_catalog as catalog
+    df = catalog.course_features()            # golf_holes_full.csv with a shapely "geometry" column
+    yards = catalog.broadie_yards()
+'''
+import functools
+import hashlib
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+import shapely
+
+# === Paths ===
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+COURSE_DIR = os.path.join(REPO_DIR, "PART 1", "Map Digitisation", "Mountain Meadows", "dataMM")
+GOLF_HOLES_FULL = os.path.join(COURSE_DIR, "golf_holes_full.csv")
+GOLF_HOLES_YARDAGE = os.path.join(COURSE_DIR, "golf_holes_yardage.csv")
+ROTATED_GOLF_HOLES = os.path.join(COURSE_DIR, "rotated_golf_holes.csv")
+HOLE_LINES = os.path.join(COURSE_DIR, "hole_lines.csv")
+BROADIE_DIR = os.path.join(REPO_DIR, "PART 1", "broadiedata")
+BROADIE_YARDS = os.path.join(BROADIE_DIR, "strokes_by_lie_yards_broadie.csv")
+BROADIE_FEET = os.path.join(BROADIE_DIR, "strokes_on_green_feet_broadie.csv")
+SHOTS_DIR = os.path.join(REPO_DIR, "Golfmetrics data", "Data Processing")
+
+# Binary geometry stored next to each WKT CSV (packed WKB, see save_geometries)
+GEOMETRY_SUFFIX = ".geom.npz"
+
+# Per-machine cache of parsed inputs (override with GOLF_CACHE_DIR)
+CACHE_DIR = os.environ.get("GOLF_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "golfModeL47"))
+
+# Bump when a loader's output changes so old cache entries are ignored
+CACHE_VERSION = 1
+
+_memo = {}
+
+
+# ----------------------------------------
+# 🗄️ Caching
+# ----------------------------------------
+def file_signature(path):
+    """
+    (absolute path, mtime in ns, size in bytes): changes whenever the file is rewritten.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def cached_loader(fn):
+    """
+    Memoise fn(path, ...) in-process and on disk, keyed by the loader, its arguments and the file signature.
+
+    DataFrames are returned as copies so callers can add columns without touching the cached one.
+    """
+    @functools.wraps(fn)
+    def wrapper(path, *args, **kwargs):
+        key = (fn.__name__, CACHE_VERSION, file_signature(path), args, tuple(sorted(kwargs.items())))
+        if key not in _memo:
+            _memo[key] = _disk_cached(key, lambda: fn(path, *args, **kwargs))
+        value = _memo[key]
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    wrapper.uncached = fn
+    return wrapper
+
+
+def _disk_cached(key, build):
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".pkl")
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    value = build()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)   # atomic, so concurrent scripts never read half a file
+    except OSError:
+        pass   # read-only home etc.: still memoised in-process
+    return value
+
+
+def clear_cache():
+    """
+    Drop the in-process memo and every on-disk entry.
+    """
+    _memo.clear()
+    if os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(CACHE_DIR, name))
+
+
+# ----------------------------------------
+# ⛳ Course geometry
+# ----------------------------------------
+def geometry_sidecar(path):
+    """
+    Binary geometry file kept next to a WKT CSV: course.csv → course.geom.npz.
+    """
+    return os.path.splitext(path)[0] + GEOMETRY_SUFFIX
+
+
+def save_geometries(path, geometries, source_digest=""):
+    """
+    Write geometries as packed WKB: one uint8 buffer plus int64 offsets (geometry i is wkb[offsets[i]:offsets[i + 1]]).
+
+    Parameters:
+    - path: .geom.npz file
+    - geometries: shapely objects (None allowed)
+    - source_digest: SHA-1 of the CSV they came from, so a stale file is never read back
+    """
+    wkb = shapely.to_wkb(np.asarray(geometries, dtype=object))
+    lengths = [0 if g is None else len(g) for g in wkb]
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, wkb=np.frombuffer(b"".join(g for g in wkb if g is not None), dtype=np.uint8),
+             offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+             missing=np.array([g is None for g in wkb]), source_digest=np.array(source_digest))
+    os.replace(tmp, path)   # atomic, so concurrent scripts never read half a file
+
+
+def load_geometries(path):
+    """
+    Rebuild every geometry of a .geom.npz in one vectorised from_wkb call.
+
+    Returns:
+    - (object array of shapely geometries, source digest)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        buf, offsets, missing = data["wkb"].tobytes(), data["offsets"], data["missing"]
+        wkb = np.array([None if m else buf[a:b] for a, b, m in zip(offsets[:-1], offsets[1:], missing)], dtype=object)
+        return shapely.from_wkb(wkb), str(data["source_digest"])
+
+
+def table_geometries(path, wkt):
+    """
+    Geometries of a WKT CSV: read from its binary sidecar when that matches the CSV's content, otherwise
+    parsed from the WKT text once and the sidecar (re)written.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    sidecar = geometry_sidecar(path)
+    try:
+        geometries, source_digest = load_geometries(sidecar)
+        if source_digest == digest and len(geometries) == len(wkt):
+            return geometries
+    except (OSError, KeyError, ValueError):
+        pass
+
+    geometries = shapely.from_wkt(np.asarray(wkt, dtype=object))
+    try:
+        save_geometries(sidecar, geometries, digest)
+    except OSError:
+        pass   # read-only checkout: parse again next time
+    return geometries
+
+
+def to_wkt(geometries):
+    """
+    WKT text for a CSV's "WKT" column, vectorised; same text as each geometry's .wkt.
+    """
+    return shapely.to_wkt(np.asarray(geometries, dtype=object), rounding_precision=-1)
+
+
+def write_wkt_table(df, path, wkt_first=False):
+    """
+    Write a table with a "geometry" column as a WKT CSV plus its binary sidecar, so reading it back
+    (wkt_table) never parses the text. The caller's column order is kept: an existing WKT column is
+    overwritten in place, otherwise WKT goes last, or first with wkt_first=True (as in the QGIS exports).
+    """
+    out = df.drop(columns=["geometry"])
+    wkt = to_wkt(df["geometry"].to_numpy())
+    if "WKT" in out:
+        out["WKT"] = wkt
+    elif wkt_first:
+        out.insert(0, "WKT", wkt)
+    else:
+        out["WKT"] = wkt
+    out.to_csv(path, index=False)
+    with open(path, "rb") as f:
+        save_geometries(geometry_sidecar(path), df["geometry"].to_numpy(), hashlib.sha1(f.read()).hexdigest())
+
+
+@cached_loader
+def wkt_table(path):
+    """
+    Any CSV with a WKT column (course exports, per-hole files, hole lines).
+
+    Geometry comes from the CSV's packed-WKB sidecar (see table_geometries), so the text is parsed at most
+    once per file version.
+
+    Returns:
+    - DataFrame with the CSV columns plus "geometry" (shapely objects)
+    """
+    df = pd.read_csv(path)
+    df["geometry"] = table_geometries(path, df["WKT"].to_numpy())
+    return df
+
+
+def course_features(path=GOLF_HOLES_FULL):
+    """
+    Every digitised course polygon (WKT, lie, hole_ref, ...; hole_ref 19 = background OB / rough).
+    """
+    return wkt_table(path)
+
+
+def course_yardage(path=GOLF_HOLES_YARDAGE):
+    """
+    Per-hole polygons in yards, each hole aligned tee → green up the y axis (no hole_ref 19 background).
+    """
+    return wkt_table(path)
+
+
+def rotated_course(path=ROTATED_GOLF_HOLES):
+    """
+    Hole polygons (plus touching OB / water) rotated to face up, in lon/lat (upwardsmountainmeadows.py output).
+    """
+    return wkt_table(path)
+
+
+def hole_lines(path=HOLE_LINES):
+    """
+    Tee-to-green centre lines, one per hole ("ref" = hole number).
+    """
+    return wkt_table(path)
+
+
+# ----------------------------------------
+# 📊 Benchmarks
+# ----------------------------------------
+@cached_loader
+def csv_table(path):
+    """
+    Plain CSV table.
+    """
+    return pd.read_csv(path)
+
+
+def broadie_yards(path=BROADIE_YARDS):
+    """
+    Broadie expected strokes by lie: "Distance (yards)" + one column per lie (Tee, Fairway, ...).
+    """
+    return csv_table(path)
+
+
+def broadie_feet(path=BROADIE_FEET):
+    """
+    Broadie expected putts by distance in feet (two columns: distance, strokes).
+    """
+    return csv_table(path)
+
+
+# ----------------------------------------
+# 🏌️ Shots
+# ----------------------------------------
+def shot_store():
+    """
+    Columnar cleaned-shot store (Golfmetrics data/Data Processing/shot_store.py); already memory-mapped.
+    """
+    if "shot_store" not in _memo:
+        if SHOTS_DIR not in sys.path:
+            sys.path.insert(0, SHOTS_DIR)
+        from shot_store import ShotStore
+        _memo["shot_store"] = ShotStore.open_or_build()
+    return _memo["shot_store"]
+
+
+def shots(lie, **read_kwargs):
+    """
+    One lie's cleaned shots; read_kwargs (columns, min_dist, max_dist, units) go to ShotStore.read.
+    """
+    return shot_store().read(lie, **read_kwargs)
@@ -0,0 +1,188 @@
+'''
+Per-hole signed-distance rasters to hazards, OB and green edges.
+
+For each hole and feature class (water_hazard, OB, green, bunker) the class's polygons are rasterized on a
+regular grid (CourseLieIndex at cell centres) and turned into a signed distance with scipy's Euclidean
+distance transform: positive outside the feature, negative inside, in the course's units (yards).
+Values are stored as memory-mappable float32 .npy files next to the lie rasters:
+
+    <root>/hole_<n>/sdf_<feature>.npy      float32 (ny, nx)
+    <root>/hole_<n>/sdf_meta.json          {"transform": [res, 0, x0, 0, res, y0], "features": [...]}
+
+Lookups are vectorised bilinear interpolation, so millions of landing points get their distance to water
+(or to the edge of the green, for short-siding) in one array operation. Accuracy is about half a cell.
+
+Usage:
+    fields = HoleDistanceFields.load("lie_rasters/hole_1")
+    to_water = fields.distance("water_hazard", x, y)      # inf if the hole has no water
+'''
+import json
+import os
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+import data_catalog as catalog
+from course_index import CourseLieIndex
+from lie_raster import RASTER_DIR
+
+# === SETTINGS ===
+FEATURES = ("water_hazard", "OB", "green", "bunker")
+RESOLUTION = 0.5   # yards per cell
+MARGIN = 30.0      # yards of grid around the hole's polygons, so nearby misses still get distances
+
+
+def signed_distance(mask, resolution):
+    """
+    Signed distance (positive outside, negative inside) from a boolean cell mask, measured to the edge
+    between cells (hence the half-cell shift).
+    """
+    if not mask.any():
+        return np.full(mask.shape, np.inf, dtype=np.float32)
+    if mask.all():
+        return np.full(mask.shape, -np.inf, dtype=np.float32)
+    outside = distance_transform_edt(~mask)
+    inside = distance_transform_edt(mask)
+    return (np.where(mask, 0.5 - inside, outside - 0.5) * resolution).astype(np.float32)
+
+
+class HoleDistanceFields:
+    """
+    Signed-distance rasters of one hole, sharing one grid.
+
+    Parameters:
+    - fields: feature → (ny, nx) float32 signed distances
+    - x0, y0: centre of cell (0, 0)
+    - resolution: cell size
+    """
+
+    def __init__(self, fields, x0, y0, resolution):
+        self.fields = fields
+        self.x0, self.y0, self.resolution = float(x0), float(y0), float(resolution)
+
+    @property
+    def features(self):
+        return list(self.fields)
+
+    @property
+    def transform(self):
+        return [self.resolution, 0.0, self.x0, 0.0, self.resolution, self.y0]
+
+    # ----------------------------------------
+    # 🏗️ Build
+    # ----------------------------------------
+    @classmethod
+    def from_frame(cls, df, features=FEATURES, resolution=RESOLUTION, margin=MARGIN, background=None):
+        """
+        Build the fields of one hole.
+
+        Parameters:
+        - df: the hole's polygons ("geometry" + "lie" columns)
+        - features: lie classes to measure distances to
+        - resolution, margin: grid spacing and padding around the hole's bounds
+        - background: optional table of shared polygons (e.g. hole_ref 19 OB / water) also measured against
+        """
+        bounds = np.array([geom.bounds for geom in df["geometry"]])
+        minx, miny = bounds[:, :2].min(axis=0) - margin
+        maxx, maxy = bounds[:, 2:].max(axis=0) + margin
+        x_centres = np.arange(minx, maxx + resolution, resolution)
+        y_centres = np.arange(miny, maxy + resolution, resolution)
+        X, Y = np.meshgrid(x_centres, y_centres)
+
+        frames = [df] if background is None else [df, background]
+        fields = {}
+        for feature in features:
+            geoms = [g for frame in frames for g in frame["geometry"][frame["lie"] == feature]]
+            mask = CourseLieIndex(geoms, [feature] * len(geoms)).contains(X, Y) if geoms else np.zeros(X.shape, bool)
+            fields[feature] = signed_distance(mask, resolution)
+        return cls(fields, x_centres[0], y_centres[0], resolution)
+
+    # ----------------------------------------
+    # 🔎 Lookup
+    # ----------------------------------------
+    def distance(self, feature, x, y):
+        """
+        Bilinearly interpolated signed distance to `feature` at each point (yards; negative inside).
+        Points off the grid get the nearest edge cell's value; a feature the hole lacks gives inf.
+
+        Returns:
+        - float array shaped like x
+        """
+        if feature not in self.fields:
+            raise KeyError(f"no distance field for {feature!r} (have {self.features})")
+        field = self.fields[feature]
+        ny, nx = field.shape
+
+        fx = np.clip((np.asarray(x, dtype=float) - self.x0) / self.resolution, 0, nx - 1)
+        fy = np.clip((np.asarray(y, dtype=float) - self.y0) / self.resolution, 0, ny - 1)
+        c0 = np.minimum(fx.astype(np.intp), nx - 2) if nx > 1 else np.zeros(fx.shape, np.intp)
+        r0 = np.minimum(fy.astype(np.intp), ny - 2) if ny > 1 else np.zeros(fy.shape, np.intp)
+        c1, r1 = np.minimum(c0 + 1, nx - 1), np.minimum(r0 + 1, ny - 1)
+        tx, ty = fx - c0, fy - r0
+
+        with np.errstate(invalid="ignore"):   # inf fields: inf * 0 weights
+            top = field[r0, c0] * (1 - tx) + field[r0, c1] * tx
+            bottom = field[r1, c0] * (1 - tx) + field[r1, c1] * tx
+            out = top * (1 - ty) + bottom * ty
+        return np.where(np.isnan(out), field[r0, c0], out)
+
+    def distances(self, x, y):
+        """
+        Every feature's distance at once: feature → array.
+        """
+        return {feature: self.distance(feature, x, y) for feature in self.fields}
+
+    # ----------------------------------------
+    # 💾 Save / load
+    # ----------------------------------------
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for feature, field in self.fields.items():
+            np.save(os.path.join(path, f"sdf_{feature}.npy"), np.ascontiguousarray(field, dtype=np.float32))
+        with open(os.path.join(path, "sdf_meta.json"), "w") as f:
+            json.dump({"transform": self.transform, "features": self.features}, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Open saved fields; arrays are memory-mapped, so only the cells that are looked up are read.
+        """
+        with open(os.path.join(path, "sdf_meta.json")) as f:
+            meta = json.load(f)
+        res, _, x0, _, _, y0 = meta["transform"]
+        fields = {feature: np.load(os.path.join(path, f"sdf_{feature}.npy"), mmap_mode=mmap_mode)
+                  for feature in meta["features"]}
+        return cls(fields, x0, y0, res)
+
+
+def build_hole_fields(source=catalog.GOLF_HOLES_YARDAGE, root=RASTER_DIR, features=FEATURES,
+                      resolution=RESOLUTION, margin=MARGIN):
+    """
+    Distance fields for every hole of a course CSV; hole_ref 19 (OB / background water) counts for every hole.
+
+    Returns:
+    - dict hole → HoleDistanceFields
+    """
+    df = catalog.wkt_table(source)
+    background = df[df["hole_ref"] == 19]
+    fields = {}
+    for hole in sorted(int(h) for h in df["hole_ref"].dropna().unique() if int(h) != 19):
+        fields[hole] = HoleDistanceFields.from_frame(df[df["hole_ref"] == hole], features, resolution, margin,
+                                                     background if len(background) else None)
+        fields[hole].save(os.path.join(root, f"hole_{hole}"))
+    return fields
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build per-hole signed-distance rasters")
+    parser.add_argument("resolution", type=float, nargs="?", default=RESOLUTION, help="yards per cell")
+    parser.add_argument("--source", default=catalog.GOLF_HOLES_YARDAGE)
+    parser.add_argument("--out", default=RASTER_DIR)
+    args = parser.parse_args()
+
+    start = time.time()
+    fields = build_hole_fields(args.source, args.out, resolution=args.resolution)
+    print(f"✅ Distance fields for {len(fields)} holes saved to {args.out} in {time.time() - start:.2f}s")
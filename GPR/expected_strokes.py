@@ -0,0 +1,126 @@
+'''
+Dense per-lie expected-strokes tables with vectorised lookup.
+Built once from the Broadie benchmarks or fitted GPs, then queried with plain array indexing.
+'''
+import numpy as np
+import pandas as pd
+
+from data_catalog import BROADIE_FEET, BROADIE_YARDS, csv_table
+
+# Lie codes used by every lookup (row index into the table)
+LIES = ["tee", "fairway", "rough", "sand", "recovery", "green"]
+LIE_CODES = {lie: code for code, lie in enumerate(LIES)}
+NO_LIE = 255  # off the course / unknown lie → NaN
+
+
+def encode_lies(lies):
+    """
+    Map lie names (e.g. "fairway", "bunker", None) to uint8 lie codes.
+
+    "bunker" is treated as "sand" and "deep_rough" as "recovery"; anything else gets NO_LIE.
+    """
+    aliases = {"bunker": "sand", "deep_rough": "recovery"}
+    codes = pd.Series(lies, dtype=object).map(lambda lie: LIE_CODES.get(aliases.get(lie, lie), NO_LIE))
+    return codes.to_numpy(dtype=np.uint8)
+
+
+class ExpectedStrokesTable:
+    """
+    Expected strokes to hole out on a uniform distance grid, one row per lie.
+
+    Parameters:
+    - table: array (n_lies x n_grid) of expected strokes, rows ordered as LIES
+    - step: grid spacing in yards (grid starts at 0 yards)
+    """
+
+    def __init__(self, table, step):
+        table = np.asarray(table, dtype=float)
+        # Extra all-NaN row so NO_LIE (and any unknown code) indexes to NaN without branching
+        self.table = np.vstack([table, np.full((1, table.shape[1]), np.nan)])
+        self.step = float(step)
+        self.n_grid = table.shape[1]
+        self.distances = np.arange(self.n_grid) * self.step
+
+    # ----------------------------------------
+    # 🏗️ Builders
+    # ----------------------------------------
+    @classmethod
+    def from_broadie(cls, yards_path=BROADIE_YARDS, feet_path=BROADIE_FEET, step=0.5, max_dist=600):
+        """
+        Build from the Broadie benchmark tables (green distances converted from feet to yards).
+
+        Distances outside a table's range take the nearest end value, like the old
+        reindex(method="nearest") lookup.
+        """
+        yards = csv_table(yards_path)
+        feet = csv_table(feet_path)
+        grid = np.arange(0, max_dist + step / 2, step)
+
+        table = np.empty((len(LIES), len(grid)))
+        for lie in LIES:
+            if lie == "green":
+                d = feet["Distance (feet)"].to_numpy(dtype=float) / 3
+                v = feet["Green"].to_numpy(dtype=float)
+            else:
+                col = yards[lie.capitalize()]
+                d = yards["Distance (yards)"].to_numpy(dtype=float)
+                v = col.interpolate(method="linear", limit_direction="both").to_numpy(dtype=float)
+            table[LIE_CODES[lie]] = np.interp(grid, d, v)
+        return cls(table, step)
+
+    @classmethod
+    def from_models(cls, models, x_scale=None, step=0.5, max_dist=600, fallback=None):
+        """
+        Build from fitted GP models (GPModel, SparseGPModel or anything with predict(design)).
+
+        Parameters:
+        - models: dict lie → fitted model
+        - x_scale: dict lie → factor turning yards into the model's input units
+                   (e.g. 3.0 for the putting GP in feet, 1 / 300 for the from-scratch fits)
+        - fallback: ExpectedStrokesTable supplying lies without a model (e.g. Broadie)
+        """
+        x_scale = x_scale or {}
+        grid = np.arange(0, max_dist + step / 2, step)
+        table = np.full((len(LIES), len(grid)), np.nan)
+        if fallback is not None:
+            table[:] = fallback.lookup(grid[None, :], np.arange(len(LIES))[:, None])
+
+        for lie, model in models.items():
+            pred = model.predict(grid * x_scale.get(lie, 1.0))
+            table[encode_lies([lie])[0]] = pred[0] if isinstance(pred, tuple) else pred
+        return cls(table, step)
+
+    # ----------------------------------------
+    # 🔍 Lookup
+    # ----------------------------------------
+    def lookup(self, distances, lie_codes):
+        """
+        Linearly interpolated expected strokes for many (distance, lie) pairs at once.
+
+        Parameters:
+        - distances: distances to the hole in yards (any shape)
+        - lie_codes: integer lie codes, broadcastable against distances (see LIE_CODES / encode_lies())
+
+        Returns:
+        - expected strokes, NaN where the lie code is NO_LIE or unknown
+        """
+        pos = np.clip(np.asarray(distances, dtype=float) / self.step, 0, self.n_grid - 1)
+        i0 = np.minimum(pos.astype(np.intp), self.n_grid - 2)
+        frac = pos - i0
+        rows = np.minimum(np.asarray(lie_codes, dtype=np.intp), len(self.table) - 1)
+        lo = self.table[rows, i0]
+        hi = self.table[rows, i0 + 1]
+        return lo + frac * (hi - lo)
+
+    # ----------------------------------------
+    # 💾 Save / load
+    # ----------------------------------------
+    def save(self, path):
+        np.savez_compressed(path, table=self.table[:-1], step=self.step, lies=np.asarray(LIES))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if list(data["lies"]) != LIES:
+                raise ValueError(f"{path} was built with lies {list(data['lies'])}, expected {LIES}")
+            return cls(data["table"], float(data["step"]))
@@ -0,0 +1,181 @@
+'''
+Persisted fitted-GP artifacts (.npz) keyed by a hash of the shot file and the fit settings.
+Downstream code loads the factorised model in milliseconds and predicts at any distance.
+'''
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from gp_engine import GPModel
+from gp_online import OnlineGPModel
+from gp_sparse import SparseGPModel
+
+# Bump when the stored layout changes so old artifacts are rebuilt
+ARTIFACT_VERSION = 1
+
+# Arrays and scalars needed to predict without refitting, per model kind
+MODEL_FIELDS = {
+    "exact": (GPModel, ["x", "y", "L", "alpha", "sig"]),
+    "sparse": (SparseGPModel, ["z", "Luu", "LB", "w", "c"]),
+    "online": (OnlineGPModel, ["x", "y", "L", "alpha", "sig"]),
+}
+SCALAR_FIELDS = ["lam", "amp", "mean", "jitter"]
+
+
+# ----------------------------------------
+# 🔑 Artifact keys
+# ----------------------------------------
+def file_hash(path, block_size=1 << 20):
+    """
+    SHA-1 of a file's contents, read in blocks.
+    """
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def artifact_key(data_paths, settings):
+    """
+    Key identifying one fit: the contents of every input file plus the fit settings.
+
+    Parameters:
+    - data_paths: cleaned shot file (or list of files) the model was fit on
+    - settings: dict of everything else that changes the fit (filters, bins, hyperparameters)
+    """
+    if isinstance(data_paths, (str, os.PathLike)):
+        data_paths = [data_paths]
+    h = hashlib.sha1(f"v{ARTIFACT_VERSION}".encode())
+    for path in data_paths:
+        h.update(file_hash(path).encode())
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+# ----------------------------------------
+# 💾 Save / load
+# ----------------------------------------
+def save_model(model, path, key, meta=None):
+    """
+    Write a fitted GP model to a compressed .npz.
+
+    Parameters:
+    - model: fitted GPModel, SparseGPModel or OnlineGPModel
+    - path: output .npz path
+    - key: artifact_key of the data + settings it was fit with
+    - meta: optional JSON-serialisable extras (e.g. the sklearn kernel string)
+    """
+    kind = ("sparse" if isinstance(model, SparseGPModel)
+            else "online" if isinstance(model, OnlineGPModel) else "exact")
+    _, fields = MODEL_FIELDS[kind]
+    arrays = {name: np.asarray(getattr(model, name), dtype=float) for name in fields}
+    arrays.update({name: np.asarray(getattr(model, name), dtype=float) for name in SCALAR_FIELDS})
+    if kind == "sparse":
+        arrays["method"] = np.asarray(model.method)
+    if kind == "online":
+        arrays["max_points"] = np.asarray(model.max_points or 0)  # 0 = unbounded
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez_compressed(path, kind=np.asarray(kind), key=np.asarray(key),
+                        meta=np.asarray(json.dumps(meta or {})), **arrays)
+
+
+def load_model(path):
+    """
+    Rebuild a fitted model from an artifact without refitting.
+
+    Returns:
+    - model: GPModel, SparseGPModel or OnlineGPModel ready for predict()
+    - key: the artifact key it was saved with
+    """
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data["kind"])
+        cls, fields = MODEL_FIELDS[kind]
+        model = cls.__new__(cls)
+        for name in fields:
+            setattr(model, name, data[name])
+        for name in SCALAR_FIELDS:
+            setattr(model, name, float(data[name]))
+        if kind == "sparse":
+            model.method = str(data["method"])
+        if kind == "online":
+            model.max_points = int(data["max_points"]) or None
+        model.meta = json.loads(str(data["meta"]))
+        key = str(data["key"])
+    return model, key
+
+
+def stored_key(path):
+    """
+    Key of an existing artifact (None if the file is missing or unreadable).
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return str(data["key"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def load_or_fit(path, data_paths, settings, fit_fn):
+    """
+    Load the artifact at `path` if it was built from the same data and settings,
+    otherwise call fit_fn() and rebuild it.
+
+    Parameters:
+    - path: artifact .npz path
+    - data_paths: shot file(s) the fit depends on
+    - settings: dict of fit settings (part of the key)
+    - fit_fn: no-argument callable returning a fitted model, or (model, meta)
+
+    Returns:
+    - model with a `meta` dict attribute
+    """
+    key = artifact_key(data_paths, settings)
+    if stored_key(path) == key:
+        model, _ = load_model(path)
+        return model
+
+    result = fit_fn()
+    model, meta = result if isinstance(result, tuple) else (result, {})
+    save_model(model, path, key, meta=meta)
+    model.meta = meta
+    return model
+
+
+# ----------------------------------------
+# 🔁 sklearn → from-scratch conversion
+# ----------------------------------------
+def model_from_sklearn(gpr):
+    """
+    Convert a fitted sklearn GaussianProcessRegressor with an RBF + WhiteKernel kernel
+    (as in GPR158Approach.py / GPR158Green.py) into a GPModel on the original y scale.
+
+    The GPModel predicts the latent curve; sklearn's return_std also adds the fitted
+    WhiteKernel level, which is returned in meta["white_noise"] (original y units²).
+
+    Returns:
+    - model: GPModel
+    - meta: dict with the kernel string and white noise variance
+    """
+    rbf, white = gpr.kernel_.k1, gpr.kernel_.k2
+    y_mean = float(np.atleast_1d(gpr._y_train_mean)[0]) if gpr.normalize_y else 0.0
+    y_std = float(np.atleast_1d(gpr._y_train_std)[0]) if gpr.normalize_y else 1.0
+    # Everything is in sklearn's normalised space; rescale so predictions come out in strokes
+    noise = white.noise_level + np.broadcast_to(gpr.alpha, (len(gpr.X_train_),))
+
+    model = GPModel.__new__(GPModel)
+    model.x = gpr.X_train_[:, 0] if gpr.X_train_.shape[1] == 1 else gpr.X_train_
+    model.y = y_mean + y_std * np.asarray(gpr.y_train_).ravel()
+    model.lam = float(rbf.length_scale)
+    model.sig = y_std * np.sqrt(noise)
+    model.amp = y_std ** 2
+    model.mean = y_mean
+    model.jitter = 0.0
+    model.L = y_std * gpr.L_
+    model.alpha = np.asarray(gpr.alpha_).ravel() / y_std
+
+    meta = {"kernel": str(gpr.kernel_), "white_noise": float(white.noise_level * y_std ** 2)}
+    return model, meta
@@ -0,0 +1,181 @@
+'''
+2D GP for surfaces measured on a regular lattice (green height maps).
+
+On a full nx x ny grid the RBF kernel factorises as K = amp * (Kx ⊗ Ky), so the n x n system
+(n = nx * ny) is solved with two small eigendecompositions instead of an n³ Cholesky.
+Heights, slopes and their uncertainties at any grid of points follow from small matrix products.
+'''
+import numpy as np
+from scipy.optimize import minimize
+
+from gp_engine import rbf_kernel_matrix
+from gp_hyperopt import default_bounds
+
+
+def grid_from_points(x, y, z):
+    """
+    Arrange a (x, y, z) point cloud on a complete lattice.
+
+    Returns:
+    - x_vals (nx), y_vals (ny): lattice coordinates
+    - Z: heights, shape (ny, nx) (rows = y, as in np.meshgrid)
+    """
+    x_vals, ix = np.unique(np.asarray(x, dtype=float), return_inverse=True)
+    y_vals, iy = np.unique(np.asarray(y, dtype=float), return_inverse=True)
+    Z = np.full((len(y_vals), len(x_vals)), np.nan)
+    Z[iy, ix] = z
+    if len(z) != Z.size or np.isnan(Z).any():
+        raise ValueError(f"{len(z)} points do not fill a {len(x_vals)} x {len(y_vals)} grid")
+    return x_vals, y_vals, Z
+
+
+def _eig(K):
+    # Eigendecomposition of a PSD kernel matrix, clipping round-off negatives
+    e, Q = np.linalg.eigh(K)
+    return np.maximum(e, 0.0), Q
+
+
+def _axis_derivative(vals, design, K, lam):
+    # d/ds k(s, v) for the RBF kernel: -(s - v) / lam² * k(s, v), with design points s in the columns
+    return K * (vals[:, None] - design[None, :]) / lam ** 2
+
+
+class GridGPModel:
+    """
+    Exact GP regression of heights on a full 2D lattice with an isotropic RBF kernel.
+
+    With Kx = Qx Λx Qxᵀ and Ky = Qy Λy Qyᵀ, (K + σ²I)⁻¹ = (Qx ⊗ Qy) (amp Λx ⊗ Λy + σ²)⁻¹ (Qx ⊗ Qy)ᵀ.
+    Fitting is O(nx³ + ny³ + nx ny (nx + ny)) and needs no n x n matrix.
+
+    Parameters:
+    - x_vals, y_vals: lattice coordinates (shape: nx, ny)
+    - Z: observed heights, shape (ny, nx)
+    - lam: RBF length scale (same units as x, y)
+    - sig: noise standard deviation of the height measurements
+    - amp: signal variance of the kernel
+    - mean: constant prior mean (defaults to the average height)
+    """
+
+    def __init__(self, x_vals, y_vals, Z, lam, sig, amp=1.0, mean=None):
+        self.x_vals = np.asarray(x_vals, dtype=float)
+        self.y_vals = np.asarray(y_vals, dtype=float)
+        self.Z = np.asarray(Z, dtype=float)
+        self.lam = float(lam)
+        self.sig = float(sig)
+        self.amp = float(amp)
+        self.mean = float(self.Z.mean() if mean is None else mean)
+        self.fit()
+
+    @classmethod
+    def from_points(cls, x, y, z, lam=None, sig=None, amp=1.0, mean=None):
+        """
+        Fit from a (x, y, height) cloud on a regular lattice (e.g. example_green.csv).
+        If lam or sig is not given, all hyperparameters are fitted by marginal likelihood.
+        """
+        x_vals, y_vals, Z = grid_from_points(x, y, z)
+        if lam is None or sig is None:
+            params = fit_grid_hyperparameters(x_vals, y_vals, Z, mean=mean)
+            lam, sig, amp, mean = params["length_scale"], params["noise_sigma"], params["amp"], params["mean"]
+        return cls(x_vals, y_vals, Z, lam, sig, amp=amp, mean=mean)
+
+    def fit(self):
+        self.ex, self.Qx = _eig(rbf_kernel_matrix(self.x_vals, self.x_vals, self.lam))
+        self.ey, self.Qy = _eig(rbf_kernel_matrix(self.y_vals, self.y_vals, self.lam))
+        # Eigenvalues of K + σ²I on the (y, x) grid
+        self.S = self.amp * np.outer(self.ey, self.ex) + self.sig ** 2
+        R = self.Z - self.mean
+        # alpha = (K + σ²I)⁻¹ (z - mean), kept as a (ny, nx) grid
+        self.A = self.Qy @ ((self.Qy.T @ R @ self.Qx) / self.S) @ self.Qx.T
+        return self
+
+    def _cross(self, xs, ys):
+        xs = np.atleast_1d(np.asarray(xs, dtype=float))
+        ys = np.atleast_1d(np.asarray(ys, dtype=float))
+        Kx = rbf_kernel_matrix(self.x_vals, xs, self.lam)   # nx x mx
+        Ky = rbf_kernel_matrix(self.y_vals, ys, self.lam)   # ny x my
+        return xs, ys, Kx, Ky
+
+    def _reduction(self, Ky, Kx):
+        # Diagonal of K*ᵀ (K + σ²I)⁻¹ K* on the (my, mx) design grid, for K* = amp (Kx ⊗ Ky)
+        Uy, Ux = self.Qy.T @ Ky, self.Qx.T @ Kx
+        return self.amp ** 2 * ((Uy ** 2).T @ (1 / self.S) @ (Ux ** 2))
+
+    def predict(self, xs, ys, return_var=True):
+        """
+        Posterior height on the grid xs x ys.
+
+        Parameters:
+        - xs, ys: prediction coordinates (shape: mx, my)
+        - return_var: set False to skip the variance computation
+
+        Returns:
+        - mean: heights, shape (my, mx)
+        - vars: posterior variances, shape (my, mx), unless return_var is False
+        """
+        xs, ys, Kx, Ky = self._cross(xs, ys)
+        mean = self.mean + self.amp * Ky.T @ self.A @ Kx
+        if not return_var:
+            return mean
+        vars = self.amp - self._reduction(Ky, Kx)
+        return mean, np.maximum(vars, 0.0)
+
+    def gradient(self, xs, ys, return_var=True):
+        """
+        Posterior slope (dz/dx, dz/dy) on the grid xs x ys. The derivative of a GP is a GP,
+        so the slopes come from the same alpha with differentiated cross-covariances.
+
+        Returns:
+        - dzdx, dzdy: shape (my, mx) each
+        - var_dx, var_dy: their posterior variances, unless return_var is False
+        """
+        xs, ys, Kx, Ky = self._cross(xs, ys)
+        dKx = _axis_derivative(self.x_vals, xs, Kx, self.lam)
+        dKy = _axis_derivative(self.y_vals, ys, Ky, self.lam)
+        dzdx = self.amp * Ky.T @ self.A @ dKx
+        dzdy = self.amp * dKy.T @ self.A @ Kx
+        if not return_var:
+            return dzdx, dzdy
+
+        # Prior variance of an RBF derivative is amp / lam²
+        prior = self.amp / self.lam ** 2
+        var_dx = np.maximum(prior - self._reduction(Ky, dKx), 0.0)
+        var_dy = np.maximum(prior - self._reduction(dKy, Kx), 0.0)
+        return dzdx, dzdy, var_dx, var_dy
+
+    def log_marginal_likelihood(self):
+        R = self.Z - self.mean
+        return (-0.5 * np.sum(R * self.A)
+                - 0.5 * np.log(self.S).sum()
+                - 0.5 * R.size * np.log(2 * np.pi))
+
+
+def _grid_nlml(log_params, x_vals, y_vals, R):
+    lam, sig, amp = np.exp(log_params)
+    ex, Qx = _eig(rbf_kernel_matrix(x_vals, x_vals, lam))
+    ey, Qy = _eig(rbf_kernel_matrix(y_vals, y_vals, lam))
+    S = amp * np.outer(ey, ex) + sig ** 2
+    Rt = Qy.T @ R @ Qx
+    return 0.5 * np.sum(Rt ** 2 / S) + 0.5 * np.log(S).sum() + 0.5 * R.size * np.log(2 * np.pi)
+
+
+def fit_grid_hyperparameters(x_vals, y_vals, Z, mean=None, start=None):
+    """
+    Maximise the marginal likelihood of a GridGPModel over (lam, sig, amp).
+
+    Each evaluation costs two small eigendecompositions, so L-BFGS-B with finite differences is cheap.
+
+    Returns:
+    - dict with length_scale, noise_sigma, amp, mean, lml (same keys as gp_hyperopt.fit_all)
+    """
+    Z = np.asarray(Z, dtype=float)
+    mean = float(Z.mean() if mean is None else mean)
+    R = Z - mean
+    span = max(np.ptp(x_vals), np.ptp(y_vals))
+    bounds = default_bounds(np.array([0.0, span]), R.ravel(), np.ones(1))
+    if start is None:
+        start = np.log([span / 10, 0.1 * R.std(), R.var()])
+    start = np.clip(start, bounds[:, 0], bounds[:, 1])
+    res = minimize(_grid_nlml, start, args=(x_vals, y_vals, R), method="L-BFGS-B", bounds=bounds)
+    lam, sig, amp = np.exp(res.x)
+    return {"length_scale": float(lam), "noise_sigma": float(sig), "amp": float(amp),
+            "mean": mean, "lml": float(-res.fun)}
@@ -0,0 +1,138 @@
+'''
+Marginal-likelihood hyperparameter fitting for the from-scratch GP.
+Analytic gradients + L-BFGS-B, with random restarts for every dataset spread over one process pool.
+'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.linalg import cho_solve
+from scipy.optimize import minimize
+
+from gp_engine import GPModel, squared_distances
+
+PARAM_NAMES = ["length_scale", "noise_sigma", "amp"]
+
+
+# ----------------------------------------
+# 📐 Objective + gradient
+# ----------------------------------------
+def neg_log_marginal_likelihood(log_params, D, r, noise_weights, jitter=1e-8):
+    """
+    Negative log marginal likelihood and its gradient w.r.t. log(lam, sig, amp).
+
+    K = amp * exp(-D / (2 lam²)) + sig² * diag(noise_weights)
+    dLML/dθ = ½ tr((ααᵀ - K⁻¹) dK/dθ)
+
+    Parameters:
+    - log_params: log of (length scale, noise sigma, signal variance)
+    - D: pairwise squared distances between the training inputs
+    - r: centred outputs (y - mean)
+    - noise_weights: per-observation noise multipliers (e.g. 1 / bin count)
+    """
+    lam, sig, amp = np.exp(log_params)
+    Kf = amp * np.exp(-D / (2 * lam ** 2))
+    noise = sig ** 2 * noise_weights
+    K = Kf + np.diag(noise + jitter * amp)
+    try:
+        L = np.linalg.cholesky(K)
+    except np.linalg.LinAlgError:
+        return 1e25, np.zeros(3)
+
+    alpha = cho_solve((L, True), r)
+    lml = -0.5 * r @ alpha - np.log(np.diag(L)).sum() - 0.5 * len(r) * np.log(2 * np.pi)
+
+    W = np.outer(alpha, alpha) - cho_solve((L, True), np.eye(len(r)))
+    grad = 0.5 * np.array([
+        np.sum(W * Kf * D) / lam ** 2,    # d/dlog lam
+        2 * np.sum(np.diag(W) * noise),   # d/dlog sig
+        np.sum(W * Kf),                   # d/dlog amp
+    ])
+    return -lml, -grad
+
+
+def default_bounds(x, y, noise_weights):
+    """
+    Log-space bounds for (lam, sig, amp) scaled to the data.
+    """
+    x = np.asarray(x, dtype=float)
+    span = np.ptp(x) if x.ndim == 1 else np.ptp(x, axis=0).max()
+    yvar = max(np.var(y), 1e-6)
+    sig_scale = np.sqrt(yvar / np.mean(noise_weights))
+    return np.log([
+        (span / 200, span * 2),
+        (1e-3 * sig_scale, 10 * sig_scale),
+        (1e-3 * yvar, 1e2 * yvar),
+    ])
+
+
+def _run_restart(job):
+    """
+    One L-BFGS-B run from one starting point (module-level so the pool can pickle it).
+    """
+    name, x, y, mean, noise_weights, bounds, start = job
+    D = squared_distances(x, x)
+    res = minimize(neg_log_marginal_likelihood, start, args=(D, y - mean, noise_weights),
+                   jac=True, method="L-BFGS-B", bounds=bounds)
+    return name, res.x, -res.fun
+
+
+# ----------------------------------------
+# 🔁 Parallel restarts over many datasets
+# ----------------------------------------
+def fit_all(datasets, n_restarts=8, max_workers=None, seed=0):
+    """
+    Tune (length scale, noise sigma, signal variance) for several datasets at once.
+
+    Every (dataset, restart) pair is an independent job in one process pool, so all lies
+    and putting are optimised concurrently.
+
+    Parameters:
+    - datasets: dict name → (x, y) or (x, y, noise_weights)
+    - n_restarts: random starting points per dataset (the first is the centre of the bounds)
+    - max_workers: pool size (defaults to the number of CPUs)
+
+    Returns:
+    - dict name → {"length_scale", "noise_sigma", "amp", "mean", "lml"}
+    """
+    rng = np.random.default_rng(seed)
+    jobs = []
+    means = {}
+    for name, data in datasets.items():
+        x, y = np.asarray(data[0], dtype=float), np.asarray(data[1], dtype=float)
+        w = np.asarray(data[2], dtype=float) if len(data) > 2 else np.ones(len(y))
+        # Constant prior mean = shot-weighted average of y
+        mean = means[name] = float(np.average(y, weights=1 / w))
+        bounds = default_bounds(x, y, w)
+        starts = [bounds.mean(axis=1)] + [rng.uniform(bounds[:, 0], bounds[:, 1]) for _ in range(n_restarts - 1)]
+        jobs += [(name, x, y, mean, w, bounds, start) for start in starts]
+
+    best = {}
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        for name, log_params, lml in pool.map(_run_restart, jobs):
+            if name not in best or lml > best[name][1]:
+                best[name] = (log_params, lml)
+
+    results = {}
+    for name, (log_params, lml) in best.items():
+        params = dict(zip(PARAM_NAMES, np.exp(log_params).tolist()))
+        params.update(mean=means[name], lml=float(lml))
+        results[name] = params
+    return results
+
+
+def fit_hyperparameters(x, y, noise_weights=None, n_restarts=8, max_workers=None, seed=0):
+    """
+    Tune one dataset (restarts still run in parallel).
+    """
+    data = (x, y) if noise_weights is None else (x, y, noise_weights)
+    return fit_all({"data": data}, n_restarts=n_restarts, max_workers=max_workers, seed=seed)["data"]
+
+
+def model_from_hyperparameters(x, y, params, noise_weights=None):
+    """
+    Exact GPModel with tuned hyperparameters (noise sigma scaled per observation).
+    """
+    w = np.ones(len(y)) if noise_weights is None else np.asarray(noise_weights, dtype=float)
+    return GPModel(x, y, params["length_scale"], params["noise_sigma"] * np.sqrt(w),
+                   amp=params["amp"], mean=params["mean"], jitter=1e-8 * params["amp"])
@@ -0,0 +1,102 @@
+'''
+Online exact GP: new observations are appended by extending the Cholesky factor,
+and a sliding window drops the oldest ones with a rank-k Cholesky update. Each step is O(n²), not O(n³).
+'''
+import numpy as np
+from scipy.linalg import cho_solve, lapack, solve_triangular
+
+from gp_engine import GPModel, rbf_kernel_matrix
+
+
+def chol_update(L, V):
+    """
+    Rank-k update of a lower Cholesky factor: returns L' with L' L'ᵀ = L Lᵀ + V Vᵀ. O(n²k).
+
+    L' is the R factor of the QR decomposition of [Lᵀ; Vᵀ]. LAPACK's tpqrt computes it directly,
+    exploiting that Lᵀ is triangular, with blocked (BLAS-3) Householder updates.
+
+    Parameters:
+    - L: lower Cholesky factor (n x n)
+    - V: update vectors (shape: n or n x k)
+    """
+    n = len(L)
+    Vt = np.asfortranarray(np.reshape(V, (n, -1)).T, dtype=float)
+    # Lᵀ is upper triangular, so the untouched lower part of R is already zero
+    R, _, _, info = lapack.dtpqrt(0, max(1, min(n, 32)), np.asfortranarray(L.T), Vt,
+                                  overwrite_a=1, overwrite_b=1)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"tpqrt failed with info={info}")
+    flip = np.diag(R) < 0
+    R[flip] *= -1  # keep the diagonal positive
+    return R.T
+
+
+class OnlineGPModel(GPModel):
+    """
+    GPModel that can absorb new observations (and forget old ones) without refitting.
+
+    Observations are kept in arrival order so the window can drop the oldest.
+
+    Parameters:
+    - same as GPModel, plus
+    - max_points: keep at most this many observations (None = keep everything)
+    """
+
+    def __init__(self, x, y, lam, sig, amp=1.0, mean=0.0, jitter=0.0, max_points=None):
+        self.max_points = max_points
+        super().__init__(x, y, lam, sig, amp=amp, mean=mean, jitter=jitter)
+        self.sig = np.array(self.noise_variance() ** 0.5)  # per-point, so it can grow with the data
+
+    def add(self, x_new, y_new, sig_new=None):
+        """
+        Append k new observations with a block Cholesky extension. O(n²k + k³).
+
+        Parameters:
+        - x_new, y_new: new inputs / outputs
+        - sig_new: their noise sd (defaults to the first observation's)
+        """
+        x_new = np.atleast_1d(np.asarray(x_new, dtype=float))
+        y_new = np.atleast_1d(np.asarray(y_new, dtype=float))
+        sig_new = self.sig[0] if sig_new is None else sig_new
+        sig_new = np.broadcast_to(np.asarray(sig_new, dtype=float), (len(y_new),))
+
+        # [[L11, 0], [S21, L22]] with S21 = (L11⁻¹ K12)ᵀ and L22 = chol(K22 + σ²I - S21 S21ᵀ)
+        K12 = rbf_kernel_matrix(self.x, x_new, self.lam, self.amp)
+        S = solve_triangular(self.L, K12, lower=True, check_finite=False)
+        K22 = rbf_kernel_matrix(x_new, x_new, self.lam, self.amp)
+        K22[np.diag_indices_from(K22)] += sig_new ** 2 + self.jitter
+        L22 = np.linalg.cholesky(K22 - S.T @ S)
+
+        n, k = len(self.L), len(x_new)
+        L = np.zeros((n + k, n + k))
+        L[:n, :n] = self.L
+        L[n:, :n] = S.T
+        L[n:, n:] = L22
+        self.L = L
+        self.x = np.concatenate([self.x, x_new])
+        self.y = np.concatenate([self.y, y_new])
+        self.sig = np.concatenate([self.sig, sig_new])
+
+        if self.max_points is not None and len(self.y) > self.max_points:
+            self.drop_oldest(len(self.y) - self.max_points)
+        else:
+            self._refresh_alpha()
+        return self
+
+    def drop_oldest(self, k):
+        """
+        Forget the k oldest observations. O(n²k).
+
+        With L = [[L11, 0], [L21, L22]], the remaining block K22 = L21 L21ᵀ + L22 L22ᵀ, so the
+        new factor is a rank-k update of L22 by L21.
+        """
+        if k <= 0:
+            return self
+        self.L = chol_update(self.L[k:, k:], self.L[k:, :k])
+        self.x, self.y, self.sig = self.x[k:], self.y[k:], self.sig[k:]
+        self._refresh_alpha()
+        return self
+
+    def _refresh_alpha(self):
+        # Two triangular solves against the updated factor: O(n²)
+        self.alpha = cho_solve((self.L, True), self.y - self.mean, check_finite=False)
@@ -0,0 +1,83 @@
+'''
+Posterior sampling of whole ESHO curves from a fitted GP.
+
+The posterior covariance on the design grid is factorised once. Each batch of correlated curves is then
+one (samples x rank) @ (rank x grid) product, streamed in chunks so memory stays bounded.
+'''
+import numpy as np
+
+
+class PosteriorSampler:
+    """
+    Draws correlated posterior curves f(design) ~ N(mean, cov) from a fitted GPModel / SparseGPModel
+    (or one loaded with gp_artifacts.load_model).
+
+    The covariance is factorised by eigendecomposition rather than Cholesky: on a dense grid it is
+    numerically rank-deficient, and keeping only the significant eigenpairs makes every draw cheaper.
+
+    Parameters:
+    - model: fitted model with predict(design, full_cov=True)
+    - design: grid the curves are drawn on (shape: m)
+    - rank_tol: drop eigenvalues below rank_tol * largest eigenvalue
+    - dtype: dtype of the returned samples (float32 halves memory for large draws)
+    """
+
+    def __init__(self, model, design, rank_tol=1e-10, dtype=float):
+        self.design = np.asarray(design, dtype=float)
+        self.mean, cov = model.predict(self.design, full_cov=True)
+        evals, evecs = np.linalg.eigh((cov + cov.T) / 2)
+        keep = evals > rank_tol * max(evals.max(), 0.0)
+        # cov ≈ F Fᵀ with F = Q √Λ (m x rank)
+        self.factor = (evecs[:, keep] * np.sqrt(evals[keep])).astype(dtype)
+        self.mean = self.mean.astype(dtype)
+        self.dtype = dtype
+
+    @property
+    def rank(self):
+        return self.factor.shape[1]
+
+    def sample(self, n_samples, seed=None):
+        """
+        Draw n_samples curves at once.
+
+        Returns:
+        - array (n_samples, m): one posterior curve per row, aligned with self.design
+        """
+        rng = np.random.default_rng(seed)
+        return self._draw(rng, n_samples)
+
+    def iter_samples(self, n_samples, chunk_size=1000, seed=None):
+        """
+        Stream n_samples curves as (chunk, m) arrays; peak memory is one chunk.
+        """
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_samples, chunk_size):
+            yield self._draw(rng, min(chunk_size, n_samples - start))
+
+    def _draw(self, rng, n):
+        z = rng.standard_normal((n, self.rank), dtype=np.float32 if self.dtype == np.float32 else float)
+        return self.mean + z @ self.factor.T
+
+    def at(self, samples, points):
+        """
+        Linearly interpolate sampled curves at arbitrary distances (clamped to the design range).
+
+        Parameters:
+        - samples: array (n_samples, m) from sample() / iter_samples()
+        - points: distances to evaluate (shape: k)
+
+        Returns:
+        - array (n_samples, k)
+        """
+        points = np.clip(np.asarray(points, dtype=float), self.design[0], self.design[-1])
+        hi = np.clip(np.searchsorted(self.design, points), 1, len(self.design) - 1)
+        lo = hi - 1
+        w = (points - self.design[lo]) / (self.design[hi] - self.design[lo])
+        return samples[:, lo] * (1 - w) + samples[:, hi] * w
+
+
+def sample_curves(model, design, n_samples, seed=None):
+    """
+    One-call helper: n_samples posterior curves of `model` on `design`, shape (n_samples, m).
+    """
+    return PosteriorSampler(model, design).sample(n_samples, seed=seed)
@@ -0,0 +1,177 @@
+'''
+Sparse (inducing-point) Gaussian Process regression, FITC and VFE flavours.
+Fits directly on raw shots in O(n·m²) time; training data is streamed in chunks so memory is O(chunk·m).
+'''
+import numpy as np
+from scipy.linalg import solve_triangular
+
+from gp_engine import rbf_kernel_matrix
+
+
+# ----------------------------------------
+# 📍 Inducing point selection
+# ----------------------------------------
+def select_inducing_points(x, lam, max_points=200, seed=0):
+    """
+    Pick inducing inputs automatically.
+
+    1D inputs get an even grid over the data range with spacing ~lam/2 (an RBF with length
+    scale lam cannot vary faster than that), capped at max_points. Multi-dimensional inputs
+    get a random subset of the distinct observed points.
+
+    Parameters:
+    - x: observed inputs (shape: n or n x d)
+    - lam: RBF length scale
+    - max_points: upper bound on the number of inducing points
+
+    Returns:
+    - inducing inputs (shape: m or m x d, same layout as x)
+    """
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        lo, hi = x.min(), x.max()
+        m = int(np.clip(np.ceil((hi - lo) / (lam / 2)) + 1, 2, max_points))
+        return np.linspace(lo, hi, m)
+
+    distinct = np.unique(x, axis=0)
+    if len(distinct) <= max_points:
+        return distinct
+    rng = np.random.default_rng(seed)
+    return distinct[rng.choice(len(distinct), max_points, replace=False)]
+
+
+# ----------------------------------------
+# 🤖 Sparse GP model
+# ----------------------------------------
+class SparseGPModel:
+    """
+    Inducing-point GP with an RBF kernel.
+
+    method="vfe": Titsias variational approximation (Λ = σ²I, trace penalty in the bound)
+    method="fitc": Snelson & Ghahramani (Λ = diag(Kff - Qff) + σ²I)
+
+    With A = Luu⁻¹ Kuf and B = I + A Λ⁻¹ Aᵀ, everything needed for prediction is an m x m
+    matrix, so the n x n kernel is never formed.
+
+    Parameters:
+    - x: observed inputs (shape: n or n x d)
+    - y: observed outputs (shape: n), e.g. raw shots_to_hole_out
+    - lam: RBF length scale
+    - sig: noise standard deviation (scalar, or one value per observation)
+    - amp: signal variance of the kernel
+    - mean: constant prior mean (use the data mean for raw strokes)
+    - inducing: inducing inputs; picked with select_inducing_points when None
+    - n_inducing: cap on the number of automatically chosen inducing points
+    - method: "vfe" or "fitc"
+    - chunk_size: rows of training data processed at a time
+    """
+
+    def __init__(self, x, y, lam, sig, amp=1.0, mean=0.0, inducing=None, n_inducing=200,
+                 method="vfe", jitter=1e-8, chunk_size=20000):
+        if method not in ("vfe", "fitc"):
+            raise ValueError(f"Unknown sparse method: {method}")
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.lam = float(lam)
+        self.sig = sig
+        self.amp = float(amp)
+        self.mean = float(mean)
+        self.method = method
+        self.jitter = float(jitter)
+        self.chunk_size = int(chunk_size)
+        if inducing is None:
+            inducing = select_inducing_points(self.x, self.lam, max_points=n_inducing)
+        self.z = np.asarray(inducing, dtype=float)
+        self.fit()
+
+    def noise_variance(self):
+        return np.broadcast_to(np.asarray(self.sig, dtype=float) ** 2, (len(self.x),))
+
+    def fit(self):
+        m = len(self.z)
+        Kuu = rbf_kernel_matrix(self.z, self.z, self.lam, self.amp)
+        Kuu[np.diag_indices_from(Kuu)] += self.jitter * self.amp
+        self.Luu = np.linalg.cholesky(Kuu)
+
+        noise = self.noise_variance()
+        r = self.y - self.mean
+        AAt = np.zeros((m, m))   # A Λ⁻¹ Aᵀ
+        Ar = np.zeros(m)         # A Λ⁻¹ r
+        self._log_lambda = 0.0   # Σ log Λ
+        self._r_lambda_r = 0.0   # rᵀ Λ⁻¹ r
+        self._trace = 0.0        # Σ (Kff - Qff) / σ²  (VFE bound only)
+
+        # 🔁 Stream over the training rows: memory stays O(chunk · m)
+        for start in range(0, len(self.x), self.chunk_size):
+            sl = slice(start, start + self.chunk_size)
+            A = solve_triangular(self.Luu, rbf_kernel_matrix(self.z, self.x[sl], self.lam, self.amp),
+                                 lower=True, check_finite=False)
+            resid_var = np.maximum(self.amp - np.einsum("ij,ij->j", A, A), 0.0)
+            lam_diag = noise[sl] + resid_var if self.method == "fitc" else noise[sl]
+            Aw = A / lam_diag
+            AAt += Aw @ A.T
+            Ar += Aw @ r[sl]
+            self._log_lambda += np.log(lam_diag).sum()
+            self._r_lambda_r += (r[sl] ** 2 / lam_diag).sum()
+            if self.method == "vfe":
+                self._trace += (resid_var / noise[sl]).sum()
+
+        B = AAt + np.eye(m)
+        self.LB = np.linalg.cholesky(B)
+        self.c = solve_triangular(self.LB, Ar, lower=True, check_finite=False)
+        # Weights on Kuf-space: mean(x*) = μ + Ku*ᵀ w
+        self.w = solve_triangular(self.Luu.T,
+                                  solve_triangular(self.LB.T, self.c, lower=False, check_finite=False),
+                                  lower=False, check_finite=False)
+        return self
+
+    def predict(self, design, full_cov=False, return_var=True):
+        """
+        Posterior predictive distribution of the latent curve at the design points.
+
+        Parameters:
+        - design: new input locations (shape: m or m x d)
+        - full_cov: return the full posterior covariance instead of the variances
+        - return_var: set False to skip the variance computation entirely
+
+        Returns:
+        - mean: posterior mean (shape: m*)
+        - vars (shape: m*) or cov (shape: m* x m*), unless return_var is False
+        """
+        Kus = rbf_kernel_matrix(self.z, design, self.lam, self.amp)
+        mean = self.mean + Kus.T @ self.w
+        if not return_var and not full_cov:
+            return mean
+
+        As = solve_triangular(self.Luu, Kus, lower=True, check_finite=False)
+        Bs = solve_triangular(self.LB, As, lower=True, check_finite=False)
+        if full_cov:
+            cov = rbf_kernel_matrix(design, design, self.lam, self.amp) - As.T @ As + Bs.T @ Bs
+            return mean, cov
+        vars = self.amp - np.einsum("ij,ij->j", As, As) + np.einsum("ij,ij->j", Bs, Bs)
+        return mean, np.maximum(vars, 0.0)
+
+    def log_marginal_likelihood(self):
+        """
+        FITC log marginal likelihood, or the VFE evidence lower bound.
+        """
+        n = len(self.x)
+        lml = (-0.5 * n * np.log(2 * np.pi)
+               - np.log(np.diag(self.LB)).sum()
+               - 0.5 * self._log_lambda
+               - 0.5 * (self._r_lambda_r - self.c @ self.c))
+        if self.method == "vfe":
+            lml -= 0.5 * self._trace
+        return lml
+
+
+def sparse_gpreg(x, y, lam, sig, design, mean=0.0, n_inducing=200, method="vfe"):
+    """
+    gpreg-style wrapper around SparseGPModel for raw (unbinned) shot data.
+
+    Returns:
+    - mean: predicted posterior mean at design points
+    - vars: predicted posterior variances
+    """
+    model = SparseGPModel(x, y, lam, sig, mean=mean, n_inducing=n_inducing, method=method)
+    return model.predict(design)
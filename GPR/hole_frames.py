@@ -0,0 +1,127 @@
+'''
+Per-hole coordinate frames as precomputed affine matrices.
+
+Three frames per hole:
+    "world"   coordinates as digitised (golf_holes_full.csv: lon/lat)
+    "hole"    rotated about the tee so the tee → green line points up (+y); the tee keeps its world position,
+              as in upwardsmountainmeadows.py / rotated_golf_holes.csv
+    "pin"     the hole frame shifted so the pin (green centroid) is at (0, 0), as in mmbroadie.py
+
+Any pair of frames is one 3×3 homogeneous matrix, so converting millions of points is a single
+vectorised multiply-add, and whole geometry collections go through shapely.transform in one call.
+Frames are built once per course (from the catalog's cached hole lines and features) and memoised.
+
+Usage:
+    frame = course_frames()[1]
+    x_pin, y_pin = frame.transform(x, y, "world", "pin")
+    hole_geoms = frame.transform_geometries(df["geometry"].to_numpy(), "world", "hole")
+'''
+import numpy as np
+import shapely
+from shapely.ops import unary_union
+
+import data_catalog as catalog
+
+FRAMES = ("world", "hole", "pin")
+
+_frames = {}
+
+
+class HoleFrame:
+    """
+    Affine frames of one hole.
+
+    Parameters:
+    - hole: hole number
+    - tee: (x, y) first point of the hole line, in world coordinates (rotation origin)
+    - rotate_by: degrees counter-clockwise that turn the hole line to face up (90 - line angle)
+    - pin: (x, y) in the hole frame, or None when the hole has no green (then there is no "pin" frame)
+    """
+
+    def __init__(self, hole, tee, rotate_by, pin=None):
+        self.hole = hole
+        self.tee = tuple(map(float, tee))
+        self.rotate_by = float(rotate_by)
+        self.pin = None if pin is None else tuple(map(float, pin))
+
+        # world → hole: same terms as shapely.affinity.rotate(g, rotate_by, origin=tee)
+        r = self.rotate_by * np.pi / 180.0
+        cosp, sinp = np.cos(r), np.sin(r)
+        cosp = 0.0 if abs(cosp) < 2.5e-16 else cosp
+        sinp = 0.0 if abs(sinp) < 2.5e-16 else sinp
+        x0, y0 = self.tee
+        world_to_hole = np.array([[cosp, -sinp, x0 - x0 * cosp + y0 * sinp],
+                                  [sinp, cosp, y0 - x0 * sinp - y0 * cosp],
+                                  [0.0, 0.0, 1.0]])
+
+        self._to_hole = {"world": world_to_hole, "hole": np.eye(3)}
+        if self.pin is not None:
+            self._to_hole["pin"] = np.array([[1.0, 0.0, self.pin[0]], [0.0, 1.0, self.pin[1]], [0.0, 0.0, 1.0]])
+
+    @classmethod
+    def from_line(cls, hole, line, greens=()):
+        """
+        Frame from a hole line (tee → green) and the hole's green polygons in world coordinates.
+        """
+        p1, p2 = line.coords[0], line.coords[1]
+        rotate_by = 90 - np.degrees(np.arctan2(p2[1] - p1[1], p2[0] - p1[0]))
+        frame = cls(hole, p1, rotate_by)
+        if len(greens):
+            pin = unary_union(list(frame.transform_geometries(np.asarray(greens, dtype=object), "world", "hole"))).centroid
+            frame = cls(hole, p1, rotate_by, (pin.x, pin.y))
+        return frame
+
+    def matrix(self, src, dst):
+        """
+        3×3 homogeneous matrix taking `src` coordinates to `dst` coordinates.
+        """
+        if src not in self._to_hole or dst not in self._to_hole:
+            raise ValueError(f"hole {self.hole} has no frame {src if src not in self._to_hole else dst!r} "
+                             f"(frames: {list(self._to_hole)})")
+        return np.linalg.inv(self._to_hole[dst]) @ self._to_hole[src] if dst != "hole" else self._to_hole[src]
+
+    def transform(self, x, y, src="world", dst="hole"):
+        """
+        Convert coordinate arrays (any matching shapes) between frames.
+
+        Returns:
+        - (x, y) arrays in the `dst` frame
+        """
+        m = self.matrix(src, dst)
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        # Written out term by term (like shapely's affine_transform) so results match shapely.affinity exactly
+        return m[0, 0] * x + m[0, 1] * y + m[0, 2], m[1, 0] * x + m[1, 1] * y + m[1, 2]
+
+    def transform_coords(self, coords, src="world", dst="hole"):
+        """
+        Same as transform() for an (N, 2) coordinate array.
+        """
+        xp, yp = self.transform(coords[:, 0], coords[:, 1], src, dst)
+        return np.column_stack([xp, yp])
+
+    def transform_geometries(self, geometries, src="world", dst="hole"):
+        """
+        Transform a whole array of shapely geometries at once (every vertex in one vectorised pass).
+        """
+        return shapely.transform(geometries, lambda coords: self.transform_coords(coords, src, dst))
+
+
+def course_frames(lines_path=catalog.HOLE_LINES, features_path=catalog.GOLF_HOLES_FULL):
+    """
+    HoleFrame for every hole with a hole line, memoised per version of the two input files.
+
+    Returns:
+    - dict hole → HoleFrame
+    """
+    key = (catalog.file_signature(lines_path), catalog.file_signature(features_path))
+    if key not in _frames:
+        lines = catalog.wkt_table(lines_path)
+        features = catalog.wkt_table(features_path)
+        lies = features["lie"].str.strip().str.lower()
+        frames = {}
+        for ref, line in zip(lines["ref"], lines["geometry"]):
+            hole = int(ref)
+            greens = features["geometry"][(features["hole_ref"] == hole) & (lies == "green")].to_numpy()
+            frames[hole] = HoleFrame.from_line(hole, line, greens)
+        _frames[key] = frames
+    return _frames[key]
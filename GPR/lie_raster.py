@@ -0,0 +1,221 @@
+'''
+Precomputed per-hole lie rasters: O(1) "what lie is this point?" by integer indexing.
+
+A hole's polygons are classified once (with CourseLieIndex) at every cell centre of a regular grid and
+stored as a uint8 lie grid plus its affine transform, one memory-mappable folder per hole:
+
+    <root>/hole_<n>/codes.npy       uint8 (ny, nx), position in meta["lies"] or NO_LIE
+    <root>/hole_<n>/boundary.npy    bool (ny, nx), True where a polygon edge crosses the cell
+    <root>/hole_<n>/meta.json       {"transform": [res, 0, x0, 0, res, y0], "lies": [...], ...}
+
+Cell (row, col) is centred on (x0 + col * res, y0 + row * res). Lookups round a point to its cell; cells on a
+polygon edge can optionally be re-tested exactly against the polygons.
+
+Usage:
+    raster = LieRaster.load("lie_rasters/hole_1")
+    codes = raster.lookup(x, y)
+    python lie_raster.py 0.5      # build every hole of golf_holes_yardage.csv
+'''
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_catalog as catalog
+from course_index import NO_LIE, CourseLieIndex
+
+# === SETTINGS ===
+RASTER_DIR = os.path.join(catalog.COURSE_DIR, "lie_rasters")
+RESOLUTION = 0.5   # yards per cell
+
+
+class LieRaster:
+    """
+    uint8 lie grid with an affine transform.
+
+    Parameters:
+    - codes: (ny, nx) uint8 lie codes (positions in `lies`, NO_LIE outside every polygon)
+    - x0, y0: centre of cell (0, 0)
+    - resolution: cell size
+    - lies: lie names, in code order
+    - boundary: optional (ny, nx) bool, cells a polygon edge passes through
+    - index: optional CourseLieIndex of the same polygons, for exact refinement of boundary cells
+    """
+
+    def __init__(self, codes, x0, y0, resolution, lies, boundary=None, index=None):
+        self.codes = codes
+        self.x0, self.y0, self.resolution = float(x0), float(y0), float(resolution)
+        self.lies = tuple(lies)
+        self.boundary = boundary
+        self.index = index
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def transform(self):
+        return [self.resolution, 0.0, self.x0, 0.0, self.resolution, self.y0]
+
+    @property
+    def x_centres(self):
+        return self.x0 + self.resolution * np.arange(self.shape[1])
+
+    @property
+    def y_centres(self):
+        return self.y0 + self.resolution * np.arange(self.shape[0])
+
+    # ----------------------------------------
+    # 🏗️ Build
+    # ----------------------------------------
+    @classmethod
+    def build(cls, index, x_centres, y_centres, resolution=None):
+        """
+        Rasterize an index at the given cell centres, evenly spaced `resolution` apart
+        (default: inferred from the spacing).
+
+        Centres are classified exactly; a cell is flagged as boundary when any of its corners disagrees
+        with its centre.
+        """
+        x_centres, y_centres = np.asarray(x_centres, dtype=float), np.asarray(y_centres, dtype=float)
+        if resolution is None:
+            resolution = x_centres[1] - x_centres[0] if len(x_centres) > 1 else y_centres[1] - y_centres[0]
+        X, Y = np.meshgrid(x_centres, y_centres)
+        codes = index.classify(X, Y)
+
+        half = resolution / 2
+        CX, CY = np.meshgrid(np.append(x_centres - half, x_centres[-1] + half),
+                             np.append(y_centres - half, y_centres[-1] + half))
+        corners = index.classify(CX, CY)
+        boundary = ((corners[:-1, :-1] != codes) | (corners[:-1, 1:] != codes) |
+                    (corners[1:, :-1] != codes) | (corners[1:, 1:] != codes))
+        return cls(codes, x_centres[0], y_centres[0], resolution, index.lies, boundary, index)
+
+    @classmethod
+    def from_bounds(cls, index, bounds, resolution=RESOLUTION, margin=0.0):
+        """
+        Rasterize over (minx, miny, maxx, maxy) grown by `margin`: centres at
+        np.arange(min - margin, max + margin, resolution) on each axis.
+        """
+        minx, miny, maxx, maxy = bounds
+        return cls.build(index, np.arange(minx - margin, maxx + margin, resolution),
+                         np.arange(miny - margin, maxy + margin, resolution), resolution)
+
+    @classmethod
+    def from_frame(cls, df, resolution=RESOLUTION, margin=0.0):
+        """
+        Rasterize a table of lie-tagged polygons (a "geometry" column plus "lie") over its own bounds.
+        """
+        index = CourseLieIndex.from_frame(df)
+        bounds = np.array([geom.bounds for geom in df["geometry"]])
+        return cls.from_bounds(index, (*bounds[:, :2].min(axis=0), *bounds[:, 2:].max(axis=0)), resolution, margin)
+
+    # ----------------------------------------
+    # 🔎 Lookup
+    # ----------------------------------------
+    def cell_of(self, x, y):
+        """
+        (row, col) integer cell indices of each point and a mask of points inside the raster.
+        """
+        col = np.rint((np.asarray(x, dtype=float) - self.x0) / self.resolution).astype(np.intp)
+        row = np.rint((np.asarray(y, dtype=float) - self.y0) / self.resolution).astype(np.intp)
+        inside = (row >= 0) & (row < self.shape[0]) & (col >= 0) & (col < self.shape[1])
+        return row, col, inside
+
+    def lookup(self, x, y, refine=False):
+        """
+        Lie codes of points: pure array indexing, NO_LIE outside the raster.
+
+        Parameters:
+        - x, y: coordinate arrays (same shape)
+        - refine: re-test points in boundary cells exactly against the polygons (needs self.index)
+
+        Returns:
+        - uint8 array shaped like x
+        """
+        row, col, inside = self.cell_of(x, y)
+        codes = np.full(row.shape, NO_LIE, dtype=np.uint8)
+        codes[inside] = self.codes[row[inside], col[inside]]
+
+        if refine:
+            if self.index is None:
+                raise ValueError("refine=True needs the raster's CourseLieIndex (pass index= to load())")
+            edge = inside.copy()
+            edge[inside] = self.boundary[row[inside], col[inside]]
+            x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+            codes[edge] = self.index.classify(x[edge], y[edge])
+        return codes
+
+    def lie_of(self, x, y, default=None, refine=False):
+        """
+        Lie names (object array shaped like x); `default` outside every polygon.
+        """
+        names = np.array(list(self.lies) + [default], dtype=object)
+        codes = self.lookup(x, y, refine).astype(np.intp)
+        return names[np.where(codes == NO_LIE, len(self.lies), codes)]
+
+    def states(self, default="rough"):
+        """
+        One row per cell centre (x, y, lie), x-major as in 02_generate_state_space.py's states.csv.
+        """
+        X, Y = np.meshgrid(self.x_centres, self.y_centres, indexing="ij")
+        names = np.array(list(self.lies) + [default], dtype=object)
+        codes = self.codes.T.astype(np.intp)
+        return pd.DataFrame({"x": X.ravel(), "y": Y.ravel(),
+                             "lie": names[np.where(codes == NO_LIE, len(self.lies), codes)].ravel()})
+
+    # ----------------------------------------
+    # 💾 Save / load
+    # ----------------------------------------
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "codes.npy"), np.ascontiguousarray(self.codes, dtype=np.uint8))
+        if self.boundary is not None:
+            np.save(os.path.join(path, "boundary.npy"), np.ascontiguousarray(self.boundary, dtype=bool))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"transform": self.transform, "lies": list(self.lies), "no_lie": NO_LIE,
+                       "shape": list(self.shape)}, f, indent=2)
+
+    @classmethod
+    def load(cls, path, index=None, mmap_mode="r"):
+        """
+        Open a saved raster; the arrays are memory-mapped, so nothing is read until it is indexed.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        res, _, x0, _, _, y0 = meta["transform"]
+        boundary_path = os.path.join(path, "boundary.npy")
+        boundary = np.load(boundary_path, mmap_mode=mmap_mode) if os.path.exists(boundary_path) else None
+        return cls(np.load(os.path.join(path, "codes.npy"), mmap_mode=mmap_mode), x0, y0, res, meta["lies"],
+                   boundary, index)
+
+
+def build_hole_rasters(source=catalog.GOLF_HOLES_YARDAGE, root=RASTER_DIR, resolution=RESOLUTION, margin=1.0):
+    """
+    Rasterize every hole of a course CSV (hole_ref 19 background excluded) into root/hole_<n>.
+
+    Returns:
+    - dict hole → LieRaster
+    """
+    df = catalog.wkt_table(source)
+    rasters = {}
+    for hole in sorted(int(h) for h in df["hole_ref"].dropna().unique() if int(h) != 19):
+        rasters[hole] = LieRaster.from_frame(df[df["hole_ref"] == hole], resolution, margin)
+        rasters[hole].save(os.path.join(root, f"hole_{hole}"))
+    return rasters
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Rasterize each hole's lies")
+    parser.add_argument("resolution", type=float, nargs="?", default=RESOLUTION, help="yards per cell")
+    parser.add_argument("--source", default=catalog.GOLF_HOLES_YARDAGE)
+    parser.add_argument("--out", default=RASTER_DIR)
+    args = parser.parse_args()
+
+    start = time.time()
+    rasters = build_hole_rasters(args.source, args.out, args.resolution)
+    print(f"✅ {len(rasters)} hole rasters saved to {args.out} in {time.time() - start:.2f}s")
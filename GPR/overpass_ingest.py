@@ -0,0 +1,321 @@
+'''
+Offline ingest of cached Overpass API responses into course polygons (no QGIS export needed).
+
+Each cache/*.json response is read as a stream of elements: nodes go straight into id / lon / lat arrays
+(a sorted node-id index, so a way's coordinates are one searchsorted gather), while ways and relations are
+kept. Closed ways and multipolygon relations (outer / inner member ways, joined into rings) become lie-tagged
+polygons; golf=hole ways become hole lines. Coordinates are projected from lon/lat to local yards with a
+vectorised WGS84 east-north-up tangent plane around the course centre.
+
+Output per response, in <out>/<cache file stem>/ (same columns as golf_holes_full.csv / hole_lines.csv,
+plus a packed-WKB sidecar for each, see data_catalog.write_wkt_table):
+    golf_holes_local.csv   features in yards (x east, y north of the origin)
+    hole_lines_local.csv   tee → green lines in yards
+    meta.json              projection origin, counts and the SHA-1 of the response it came from
+
+Responses whose content hash matches meta.json are skipped, and the rest are processed in parallel.
+
+Usage:
+    python overpass_ingest.py                        # every file in PART 1/Map Digitisation/cache
+    features = catalog.wkt_table(".../golf_holes_local.csv")
+'''
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.ops import linemerge, polygonize, unary_union
+
+import data_catalog as catalog
+from parallel import parallel_map
+
+# === SETTINGS ===
+CACHE_DIR = os.path.join(catalog.REPO_DIR, "PART 1", "Map Digitisation", "cache")
+INGEST_DIR = os.path.join(catalog.REPO_DIR, "PART 1", "Map Digitisation", "ingested")
+BACKGROUND_HOLE = 19     # hole_ref of features not tied to a hole, as in golf_holes_full.csv
+HOLE_SNAP_YARDS = 60     # untagged features within this distance of a hole line belong to that hole
+
+# OSM tags → lie (first match wins)
+LIE_TAGS = [
+    ("golf", "green", "green"),
+    ("golf", "tee", "tee"),
+    ("golf", "bunker", "bunker"),
+    ("golf", "fairway", "fairway"),
+    ("golf", "rough", "rough"),
+    ("golf", "water_hazard", "water_hazard"),
+    ("golf", "lateral_water_hazard", "water_hazard"),
+    ("natural", "water", "water_hazard"),
+    ("golf", "out_of_bounds", "OB"),
+    ("natural", "sand", "bunker"),
+]
+
+# WGS84
+_A = 6378137.0
+_E2 = 6.69437999014e-3
+METRES_PER_YARD = 0.9144
+
+
+# ----------------------------------------
+# 🌊 Streaming read
+# ----------------------------------------
+def iter_elements(path, chunk_size=1 << 16):
+    """
+    Yield the objects of an Overpass response's "elements" array one at a time, reading the file in chunks.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf, pos = "", -1
+        while pos < 0:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+            key = buf.find('"elements"')
+            pos = buf.find("[", key) + 1 if key >= 0 else -1
+            if key >= 0 and pos == 0:
+                pos = -1
+
+        while True:
+            # Skip separators, then decode one element (reading more if it runs past the buffer)
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    if buf[pos:].strip():
+                        raise ValueError(f"{path}: truncated Overpass response")
+                    return
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield element
+            pos = end
+            if pos > chunk_size:
+                buf, pos = buf[pos:], 0
+
+
+def read_response(path):
+    """
+    Split a response into a node index and its ways / relations.
+
+    Returns:
+    - (node_ids sorted int64, lon, lat, ways: id → element, relations: list of elements)
+    """
+    ids, lons, lats, ways, relations = [], [], [], {}, []
+    for element in iter_elements(path):
+        kind = element.get("type")
+        if kind == "node":
+            ids.append(element["id"])
+            lons.append(element["lon"])
+            lats.append(element["lat"])
+        elif kind == "way":
+            ways[element["id"]] = element
+        elif kind == "relation":
+            relations.append(element)
+
+    ids = np.asarray(ids, dtype=np.int64)
+    order = np.argsort(ids, kind="stable")
+    return ids[order], np.asarray(lons, dtype=float)[order], np.asarray(lats, dtype=float)[order], ways, relations
+
+
+# ----------------------------------------
+# 🌍 Projection
+# ----------------------------------------
+def _ecef(lon, lat):
+    lon, lat = np.radians(lon), np.radians(lat)
+    n = _A / np.sqrt(1 - _E2 * np.sin(lat) ** 2)
+    return n * np.cos(lat) * np.cos(lon), n * np.cos(lat) * np.sin(lon), n * (1 - _E2) * np.sin(lat)
+
+
+def lonlat_to_local(lon, lat, lon0, lat0):
+    """
+    East / north offsets in yards from (lon0, lat0) on the WGS84 local tangent plane, for whole arrays.
+    """
+    x, y, z = _ecef(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+    x0, y0, z0 = _ecef(lon0, lat0)
+    dx, dy, dz = x - x0, y - y0, z - z0
+    sl, cl = np.sin(np.radians(lon0)), np.cos(np.radians(lon0))
+    sp, cp = np.sin(np.radians(lat0)), np.cos(np.radians(lat0))
+    east = -sl * dx + cl * dy
+    north = -sp * cl * dx - sp * sl * dy + cp * dz
+    return east / METRES_PER_YARD, north / METRES_PER_YARD
+
+
+# ----------------------------------------
+# 🧩 Assembly
+# ----------------------------------------
+def lie_of(tags):
+    for key, value, lie in LIE_TAGS:
+        if tags.get(key) == value:
+            return lie
+    return None
+
+
+def _way_coords(way, node_ids, xy):
+    refs = np.asarray(way["nodes"], dtype=np.int64)
+    idx = np.searchsorted(node_ids, refs)
+    idx[idx >= len(node_ids)] = 0
+    if not (node_ids[idx] == refs).all():
+        return None   # way runs outside the downloaded area
+    return xy[idx]
+
+
+def _relation_polygon(relation, ways, node_ids, xy):
+    # Member ways may be split rings: merge each role's linework, polygonize, then cut the inners out
+    rings = {"outer": [], "inner": []}
+    for member in relation.get("members", []):
+        if member.get("type") != "way" or member.get("ref") not in ways:
+            continue
+        coords = _way_coords(ways[member["ref"]], node_ids, xy)
+        if coords is not None and len(coords) >= 2:
+            rings["inner" if member.get("role") == "inner" else "outer"].append(shapely.linestrings(coords))
+    if not rings["outer"]:
+        return None
+    outer = unary_union(list(polygonize(linemerge(rings["outer"]))))
+    if rings["inner"]:
+        outer = outer.difference(unary_union(list(polygonize(linemerge(rings["inner"])))))
+    return None if outer.is_empty else outer
+
+
+def _hole_ref(tags):
+    try:
+        return int(str(tags.get("ref", "")).strip())
+    except ValueError:
+        return None
+
+
+def ingest_response(path):
+    """
+    Course features and hole lines of one cached response, in local yards.
+
+    Returns:
+    - (features DataFrame, hole lines DataFrame, meta dict); empty frames when the response has no features
+    """
+    node_ids, lon, lat, ways, relations = read_response(path)
+    columns = ["geometry", "fid", "full_id", "osm_id", "osm_type", "golf", "type", "lie", "layer", "hole_ref", "path"]
+    if len(node_ids) == 0:
+        return pd.DataFrame(columns=columns), pd.DataFrame(columns=["geometry", "full_id", "osm_id", "osm_type", "golf", "ref", "par"]), {}
+
+    lon0, lat0 = float(lon.mean()), float(lat.mean())
+    xy = np.column_stack(lonlat_to_local(lon, lat, lon0, lat0))
+
+    rows, lines = [], []
+    for way in ways.values():
+        tags = way.get("tags", {})
+        if tags.get("golf") == "hole":
+            coords = _way_coords(way, node_ids, xy)
+            if coords is not None and len(coords) >= 2:
+                lines.append({"geometry": shapely.linestrings(coords), "full_id": f"w{way['id']}", "osm_id": way["id"],
+                              "osm_type": "way", "golf": "hole", "ref": _hole_ref(tags), "par": tags.get("par")})
+            continue
+        lie = lie_of(tags)
+        if lie is None or len(way["nodes"]) < 4 or way["nodes"][0] != way["nodes"][-1]:
+            continue   # untagged, or not a closed area
+        coords = _way_coords(way, node_ids, xy)
+        if coords is not None:
+            rows.append({"geometry": shapely.make_valid(shapely.polygons(coords)), "full_id": f"w{way['id']}",
+                         "osm_id": way["id"], "osm_type": "way", "golf": tags.get("golf"), "type": None, "lie": lie,
+                         "hole_ref": _hole_ref(tags)})
+
+    for relation in relations:
+        tags = relation.get("tags", {})
+        lie = lie_of(tags)
+        if lie is None or tags.get("type") != "multipolygon":
+            continue
+        polygon = _relation_polygon(relation, ways, node_ids, xy)
+        if polygon is not None:
+            rows.append({"geometry": polygon, "full_id": f"r{relation['id']}", "osm_id": relation["id"],
+                         "osm_type": "relation", "golf": tags.get("golf"), "type": "multipolygon", "lie": lie,
+                         "hole_ref": _hole_ref(tags)})
+
+    features = pd.DataFrame(rows, columns=[c for c in columns if c not in ("fid", "layer", "path")])
+    hole_lines = pd.DataFrame(lines, columns=["geometry", "full_id", "osm_id", "osm_type", "golf", "ref", "par"])
+
+    # Untagged features go to the nearest hole line (vectorised distance), else to the background hole
+    untagged = features["hole_ref"].isna().to_numpy()
+    tagged_lines = hole_lines.dropna(subset=["ref"])
+    if untagged.any() and len(tagged_lines):
+        dist = shapely.distance(features["geometry"].to_numpy()[untagged][:, None],
+                                tagged_lines["geometry"].to_numpy()[None, :])
+        nearest = tagged_lines["ref"].to_numpy()[dist.argmin(axis=1)]
+        features.loc[untagged, "hole_ref"] = np.where(dist.min(axis=1) <= HOLE_SNAP_YARDS, nearest, BACKGROUND_HOLE)
+    features["hole_ref"] = features["hole_ref"].fillna(BACKGROUND_HOLE).astype(int)
+
+    features.insert(1, "fid", np.arange(1, len(features) + 1, dtype=float))
+    features.insert(8, "layer", "overpass")
+    features["path"] = os.path.basename(path)   # the cache file, not this machine's absolute path
+    meta = {"origin_lon": lon0, "origin_lat": lat0, "units": "yards", "nodes": int(len(node_ids)),
+            "features": int(len(features)), "hole_lines": int(len(hole_lines))}
+    return features, hole_lines, meta
+
+
+# ----------------------------------------
+# 🗂️ Batch with content-hash caching
+# ----------------------------------------
+def _digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _ingest_to(path, course_dir, digest):
+    features, hole_lines, meta = ingest_response(path)
+    os.makedirs(course_dir, exist_ok=True)
+    catalog.write_wkt_table(features, os.path.join(course_dir, "golf_holes_local.csv"), wkt_first=True)
+    catalog.write_wkt_table(hole_lines, os.path.join(course_dir, "hole_lines_local.csv"), wkt_first=True)
+    with open(os.path.join(course_dir, "meta.json"), "w") as f:
+        json.dump({**meta, "source": os.path.basename(path), "source_sha1": digest}, f, indent=2)
+    return course_dir, len(features)
+
+
+def ingest_cache(cache_dir=CACHE_DIR, out_dir=INGEST_DIR, max_workers=None, force=False):
+    """
+    Convert every cached response whose content changed since its last ingest, in parallel.
+
+    Returns:
+    - dict response path → output folder (skipped ones included)
+    """
+    jobs, done = [], {}
+    for name in sorted(os.listdir(cache_dir)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(cache_dir, name)
+        course_dir = os.path.join(out_dir, os.path.splitext(name)[0])
+        digest = _digest(path)
+        meta_path = os.path.join(course_dir, "meta.json")
+        if not force and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if json.load(f).get("source_sha1") == digest:
+                    done[path] = course_dir
+                    continue
+        jobs.append((path, course_dir, digest))
+
+    print(f"🗺️ {len(jobs)} of {len(jobs) + len(done)} cached responses changed")
+    # Run from its own __main__ block, so workers can use the platform's default start method
+    for (path, _, _), (course_dir, n) in zip(jobs, parallel_map(_ingest_to, jobs, max_workers, fork=False)):
+        print(f"✅ {os.path.basename(path)}: {n} features")
+        done[path] = course_dir
+    return done
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Turn cached Overpass responses into course polygons")
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--out", default=INGEST_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--force", action="store_true", help="re-ingest unchanged responses too")
+    args = parser.parse_args()
+
+    start = time.time()
+    ingest_cache(args.cache, args.out, args.workers, args.force)
+    print(f"⏱️ Done in {time.time() - start:.2f}s")
@@ -0,0 +1,45 @@
+'''
+One process-pool helper for the repo's parallel batch jobs (figure rendering, hole layouts, Overpass ingest).
+
+Usage:
+    outputs = parallel_map(render_hole, [(hole, layers, spec, path), ...], max_workers=4)
+'''
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def parallel_map(fn, jobs, max_workers=None, fork=True, return_exceptions=False):
+    """
+    Run fn(*job) for every job tuple across a process pool, results in job order.
+
+    Parameters:
+    - fn: module-level function (picklable)
+    - jobs: list of argument tuples
+    - max_workers: pool size (default: one per CPU, never more than there are jobs)
+    - fork: start workers with fork where the platform has it. The plotting helpers are imported by
+      scripts that run top to bottom without an `if __name__ == "__main__":` guard, and a spawned worker
+      would re-run such a script on import; forked workers don't. Pass False to use the platform default
+      when the caller is guarded.
+    - return_exceptions: put a job's exception in its result slot instead of raising it
+
+    Returns:
+    - list of fn results (or exceptions), aligned with jobs
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    context = None
+    if fork and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count(), len(jobs)), mp_context=context) as pool:
+        for future in [pool.submit(fn, *job) for job in jobs]:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+    return results
@@ -0,0 +1,89 @@
+'''
+Markov state space of a hole: snapping shot landings to the nearest state, vectorised.
+
+States are points with a lie (states.csv from 02_generate_state_space.py: x, y, lie). A KD-tree over the
+state coordinates is built once; every landing point of every simulated shot is then snapped in a single
+query instead of one distance scan over all states per shot. When the states are a full x-major grid (as
+LieRaster.states() writes them) the nearest state is found per axis by binary search over the grid lines
+instead, which gives the same answer without the tree.
+
+Usage:
+    space = StateSpace.from_csv("MarkovChaining/results/try1/states.csv")
+    idx = space.snap(x_final, y_final)          # row positions in space.states
+    landed = space.states.iloc[idx]
+'''
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+
+class StateSpace:
+    """
+    Nearest-state lookup over a table of states.
+
+    Parameters:
+    - states: DataFrame with x, y and lie columns (row order defines state indices)
+    """
+
+    def __init__(self, states):
+        self.states = states.reset_index(drop=True)
+        self.xy = self.states[["x", "y"]].to_numpy(dtype=float)
+        self.lies = self.states["lie"].to_numpy()
+
+        # Full x-major grid: state index = ix * ny + iy
+        xs, ys = np.unique(self.xy[:, 0]), np.unique(self.xy[:, 1])
+        self.is_grid = (len(xs) * len(ys) == len(self) and
+                        np.array_equal(self.xy[:, 0], np.repeat(xs, len(ys))) and
+                        np.array_equal(self.xy[:, 1], np.tile(ys, len(xs))))
+        self.x_lines, self.y_lines = (xs, ys) if self.is_grid else (None, None)
+        self._tree = None
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    def __len__(self):
+        return len(self.states)
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = cKDTree(self.xy)
+        return self._tree
+
+    @staticmethod
+    def _nearest_line(lines, v):
+        """
+        Position of the nearest value in sorted `lines` (ties to the lower one).
+        """
+        if len(lines) == 1:
+            return np.zeros(v.shape, dtype=np.intp)
+        hi = np.clip(np.searchsorted(lines, v), 1, len(lines) - 1)
+        lo = hi - 1
+        return np.where(np.abs(v - lines[lo]) <= np.abs(lines[hi] - v), lo, hi)
+
+    def snap(self, x, y):
+        """
+        Index of the nearest state to each point (Euclidean; exact ties go to the lower index,
+        like DataFrame.idxmin over the distances).
+
+        Returns:
+        - intp array shaped like x
+        """
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        if len(self) == 1:
+            return np.zeros(x.shape, dtype=np.intp)
+        if self.is_grid:
+            ix, iy = self._nearest_line(self.x_lines, x), self._nearest_line(self.y_lines, y)
+            return (ix * len(self.y_lines) + iy).astype(np.intp)
+        dist, idx = self.tree.query(np.column_stack([x.ravel(), y.ravel()]), k=2)
+
+        # cKDTree breaks exact ties arbitrarily; prefer the earlier state, as a full scan would
+        tie = dist[:, 1] == dist[:, 0]
+        return np.where(tie, idx.min(axis=1), idx[:, 0]).astype(np.intp).reshape(x.shape)
+
+    def snap_states(self, x, y):
+        """
+        The nearest state's (x, y, lie) row for each point, as a DataFrame.
+        """
+        return self.states.iloc[self.snap(x, y).ravel()].reset_index(drop=True)
@@ -0,0 +1,233 @@
+'''
+Sparse Markov transition matrices P(next state | state, club, aim) over a hole's whole state space.
+
+For each action (club, aim angle) every start state fires the club's dispersion samples (dx = left/right,
+dy = forward, as in simulated_lpga_shot_data.csv), rotated by the aim, and the landings are snapped to
+states (StateSpace.snap). Start states are processed in batches; landings are turned into (row, col) keys
+and counted with one np.unique per batch, giving each action's rows as a CSR matrix of hit counts.
+
+Counts are stored (uint8 / uint16), not probabilities, so one action costs 5 bytes per non-zero;
+P = counts / samples[club]. Saved as raw CSR arrays plus a meta.json, like the lie rasters:
+
+    <root>/<club>_<aim>.indptr.npy / .indices.npy / .counts.npy     int32 / int32 / uint8
+    <root>/meta.json            {"actions": [{"club", "aim", "file", "samples"}], "n_states", "target", ...}
+
+Hole 1 on the 3-yard grid of 02_generate_state_space.py (9.5k states), 14 clubs × 5 aims: ~190 MB, built in
+about 11 s. The 1-yard grid (85k states) is ~2.5 GB (0.9 GB with compressed=True) in about 100 s.
+
+Terminal lies (the green: finished by the putting model) and start states you exclude get empty rows.
+The lie a shot is played from does not change its dispersion (the samples have no lie column).
+
+Usage:
+    space = StateSpace.from_csv("MarkovChaining/results/try1/states.csv")
+    shots = pd.read_csv("MarkovChaining/try1data/simulated_lpga_shot_data.csv")
+    transitions = build_transitions(space, shots, target=pin)
+    transitions.save("MarkovChaining/results/try1/transitions")
+    P = TransitionSet.load("MarkovChaining/results/try1/transitions").probabilities(("Driver", 0))
+'''
+import json
+import os
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+# === SETTINGS ===
+AIMS = (-10, -5, 0, 5, 10)   # degrees left (+) / right (-) of the target line
+TERMINAL_LIES = ("green",)
+BATCH_SIZE = 4096            # start states per batch
+
+
+class TransitionSet:
+    """
+    One sparse count matrix per (club, aim) action over the same state space.
+
+    Parameters:
+    - actions: list of (club, aim) pairs
+    - counts: list of (n_states, n_states) CSR hit-count matrices, aligned with actions
+    - samples: club → number of dispersion samples (row sums of non-terminal rows)
+    - target: (x, y) the aim angles are measured from the line to, or None for the +y axis
+    """
+
+    def __init__(self, actions, counts, samples, target=None):
+        self.actions = [(str(club), float(aim)) for club, aim in actions]
+        self.counts = counts
+        self.samples = {str(club): int(n) for club, n in samples.items()}
+        self.target = None if target is None else tuple(map(float, target))
+
+    @property
+    def n_states(self):
+        return self.counts[0].shape[0] if self.counts else 0
+
+    @property
+    def nbytes(self):
+        return sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in self.counts)
+
+    def index(self, action):
+        club, aim = action
+        return self.actions.index((str(club), float(aim)))
+
+    def probabilities(self, action, dtype=np.float64):
+        """
+        CSR transition probabilities of one action (rows of terminal / excluded states are empty).
+        """
+        i = self.index(action) if not isinstance(action, (int, np.integer)) else action
+        club = self.actions[i][0]
+        return (self.counts[i].astype(dtype) / self.samples[club]).tocsr()
+
+    # ----------------------------------------
+    # 💾 Save / load
+    # ----------------------------------------
+    @staticmethod
+    def _stem(club, aim):
+        return f"{re.sub(r'[^A-Za-z0-9]+', '_', club)}_{aim:g}"
+
+    def save(self, path, compressed=False):
+        """
+        Write each action's CSR arrays: raw .npy files (memory-mappable) or, with compressed=True,
+        one deflated .npz per action (a third of the size on disk, but much slower to write and read).
+        """
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for (club, aim), counts in zip(self.actions, self.counts):
+            stem = self._stem(club, aim)
+            arrays = {"indptr": counts.indptr, "indices": counts.indices, "counts": counts.data}
+            if compressed:
+                np.savez_compressed(os.path.join(path, stem + ".npz"), **arrays)
+            else:
+                for name, array in arrays.items():
+                    np.save(os.path.join(path, f"{stem}.{name}.npy"), array)
+            entries.append({"club": club, "aim": aim, "file": stem, "samples": self.samples[club]})
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"actions": entries, "n_states": self.n_states, "target": self.target,
+                       "compressed": compressed}, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Open saved transitions; uncompressed arrays are memory-mapped.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        n = meta["n_states"]
+        counts = []
+        for entry in meta["actions"]:
+            stem = os.path.join(path, entry["file"])
+            if meta.get("compressed"):
+                with np.load(stem + ".npz") as arrays:
+                    indptr, indices, data = arrays["indptr"], arrays["indices"], arrays["counts"]
+            else:
+                indptr, indices, data = (np.load(f"{stem}.{name}.npy", mmap_mode=mmap_mode)
+                                         for name in ("indptr", "indices", "counts"))
+            counts.append(sp.csr_matrix((data, indices, indptr), shape=(n, n), copy=False))
+        actions = [(e["club"], e["aim"]) for e in meta["actions"]]
+        samples = {e["club"]: e["samples"] for e in meta["actions"]}
+        return cls(actions, counts, samples, meta["target"])
+
+
+def aim_directions(space, aim, target=None):
+    """
+    (cos, sin) of the shot direction from every state: the +y axis (as in 03_simulate_transitions.py)
+    or the line to `target`, turned `aim` degrees counter-clockwise.
+    """
+    theta = np.full(len(space), np.pi / 2) if target is None else \
+        np.arctan2(target[1] - space.xy[:, 1], target[0] - space.xy[:, 0])
+    # Dispersion is drawn facing +y, so rotate by the offset from straight up
+    rotation = theta - np.pi / 2 + np.radians(aim)
+    return np.cos(rotation), np.sin(rotation)
+
+
+def action_counts(space, dx, dy, aim=0.0, target=None, rows=None, batch_size=BATCH_SIZE):
+    """
+    Hit-count matrix of one action.
+
+    Parameters:
+    - space: StateSpace
+    - dx, dy: the club's dispersion samples (facing +y)
+    - aim, target: see aim_directions()
+    - rows: start-state indices to simulate (default: all)
+    - batch_size: start states per vectorised batch (batch_size × samples landings at a time)
+
+    Returns:
+    - (n_states, n_states) CSR matrix of hit counts
+    """
+    n = len(space)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.intp)
+    dx, dy = np.asarray(dx, dtype=float), np.asarray(dy, dtype=float)
+    cos_r, sin_r = aim_directions(space, aim, target)
+    count_dtype = np.uint8 if len(dx) <= np.iinfo(np.uint8).max else np.uint16
+
+    keys, hits = [], []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        c, s = cos_r[batch, None], sin_r[batch, None]
+        x = space.xy[batch, 0, None] + dx * c - dy * s
+        y = space.xy[batch, 1, None] + dx * s + dy * c
+        # Key = row * n + landing state; np.unique sorts them, which is exactly CSR order
+        key, count = np.unique(batch[:, None].astype(np.int64) * n + space.snap(x, y), return_counts=True)
+        keys.append(key)
+        hits.append(count.astype(count_dtype))
+
+    key = np.concatenate(keys) if keys else np.zeros(0, np.int64)
+    count = np.concatenate(hits) if hits else np.zeros(0, count_dtype)
+    return sp.csr_matrix((count, ((key // n).astype(np.int32), (key % n).astype(np.int32))), shape=(n, n))
+
+
+def build_transitions(space, dispersion, clubs=None, aims=AIMS, target=None, terminal_lies=TERMINAL_LIES,
+                      start_lies=None, batch_size=BATCH_SIZE):
+    """
+    Transition counts for every (club, aim) action over every non-terminal state.
+
+    Parameters:
+    - space: StateSpace of the hole
+    - dispersion: DataFrame with dx, dy and club columns
+    - clubs: clubs to include (default: all, in order of appearance)
+    - aims: aim offsets in degrees
+    - target: point to aim at (e.g. the pin), or None to aim along +y
+    - terminal_lies: lies whose states get no outgoing shots
+    - start_lies: if given, only states with these lies are simulated
+
+    Returns:
+    - TransitionSet
+    """
+    clubs = list(dispersion["club"].dropna().unique()) if clubs is None else list(clubs)
+    playable = ~np.isin(space.lies, list(terminal_lies))
+    if start_lies is not None:
+        playable &= np.isin(space.lies, list(start_lies))
+    rows = np.flatnonzero(playable)
+
+    actions, counts, samples = [], [], {}
+    for club in clubs:
+        shots = dispersion[dispersion["club"] == club]
+        if shots.empty:
+            continue
+        samples[club] = len(shots)
+        for aim in aims:
+            actions.append((club, aim))
+            counts.append(action_counts(space, shots["dx"], shots["dy"], aim, target, rows, batch_size))
+    return TransitionSet(actions, counts, samples, target)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import pandas as pd
+
+    from state_space import StateSpace
+
+    parser = argparse.ArgumentParser(description="Build sparse transition matrices for every club and aim")
+    parser.add_argument("states", help="states.csv (x, y, lie)")
+    parser.add_argument("dispersion", help="shot dispersion CSV (dx, dy, club)")
+    parser.add_argument("out", help="output folder")
+    parser.add_argument("--aims", type=float, nargs="+", default=list(AIMS))
+    parser.add_argument("--compressed", action="store_true", help="deflate each action (smaller, slower)")
+    parser.add_argument("--target", type=float, nargs=2, default=None, help="x y to aim at (e.g. the pin)")
+    args = parser.parse_args()
+
+    start = time.time()
+    transitions = build_transitions(StateSpace.from_csv(args.states), pd.read_csv(args.dispersion),
+                                    aims=args.aims, target=args.target)
+    transitions.save(args.out, args.compressed)
+    print(f"✅ {len(transitions.actions)} actions over {transitions.n_states} states "
+          f"({transitions.nbytes / 1e6:.0f} MB in memory) saved to {args.out} in {time.time() - start:.2f}s")
@@ -0,0 +1,228 @@
+'''
+Bellman solver for hole strategy over the Markov state space.
+
+Expected strokes to hole out from every state:
+
+    V(s) = 1 + min_a [ Σ_s' P(s'|s,a) V(s') + p_pen(s,a) (1 + V(s)) ]      (non-terminal s)
+    V(s) = expected putts from s's distance to the pin                     (terminal s: the green)
+
+where the transitions come from transition_matrix.TransitionSet (one sparse count matrix per club × aim)
+and landing in a penalty lie (water / OB) costs a stroke and replays from the same spot. Every update is a
+sparse matrix–vector product over the stored uint8 counts, never a per-state Python loop:
+
+    "jacobi"         all states from the previous sweep's values
+    "gauss-seidel"   blocks of states ordered by distance to the pin, each block using the values just
+                     updated nearer the green (converges in far fewer sweeps)
+    "prioritized"    repeatedly update the states with the largest Bellman residual, then re-check only
+                     the states that can land on them (pays off when shots are short relative to the
+                     hole; with full-length clubs most states are re-checked and Gauss–Seidel is faster)
+
+Values start at 0 and rise monotonically to the fixed point; iteration stops when the largest change
+(or residual) is below `tol`. If `max_sweeps` runs out first, solve() warns and the solution has
+converged=False.
+
+Usage:
+    solution = solve(space, transitions, putting_values(space, pin), method="gauss-seidel")
+    solution.policy_frame()             # x, y, lie, V, club, aim
+    solution.save("MarkovChaining/results/try1/value_raster")
+'''
+import json
+import os
+import warnings
+
+import numpy as np
+
+import data_catalog as catalog
+from transition_matrix import TERMINAL_LIES
+
+# === SETTINGS ===
+PENALTY_LIES = ("water_hazard", "OB")   # stroke and distance
+TOL = 1e-6
+MAX_SWEEPS = 1000
+BLOCK_SIZE = 1024                       # Gauss–Seidel block / prioritized batch size
+
+
+def putting_values(space, pin, table=None, terminal_lies=TERMINAL_LIES):
+    """
+    Terminal values: expected putts at each terminal state's distance to the pin, interpolated from a
+    (distance in feet, strokes) table (default: Broadie's strokes on the green); NaN for other states.
+    """
+    table = catalog.broadie_feet() if table is None else table
+    feet, strokes = table.iloc[:, 0].to_numpy(dtype=float), table.iloc[:, 1].to_numpy(dtype=float)
+    yards = np.hypot(space.xy[:, 0] - pin[0], space.xy[:, 1] - pin[1])
+    return np.where(np.isin(space.lies, list(terminal_lies)), np.interp(yards * 3.0, feet, strokes), np.nan)
+
+
+class ValueSolution:
+    """
+    Solved values and greedy policy over a state space.
+
+    Parameters:
+    - space: StateSpace
+    - values: V per state
+    - action: index into `actions` per state (-1 for terminal states)
+    - actions: (club, aim) list of the TransitionSet
+    - sweeps: sweeps (or prioritized batches) used; residual: largest final change
+    - converged: whether the residual got below the tolerance within the sweep cap
+    """
+
+    def __init__(self, space, values, action, actions, sweeps, residual, converged=True):
+        self.space = space
+        self.values = values
+        self.action = action
+        self.actions = list(actions)
+        self.sweeps, self.residual = sweeps, residual
+        self.converged = converged
+
+    def policy_frame(self):
+        """
+        One row per state: x, y, lie, V, club, aim (club / aim empty on terminal states).
+        """
+        clubs = np.array([club for club, _ in self.actions] + [None], dtype=object)
+        aims = np.array([aim for _, aim in self.actions] + [np.nan])
+        pick = np.where(self.action < 0, len(self.actions), self.action)
+        frame = self.space.states[["x", "y", "lie"]].copy()
+        frame["V"] = self.values
+        frame["club"] = clubs[pick]
+        frame["aim"] = aims[pick]
+        return frame
+
+    def _grid(self, per_state):
+        if not self.space.is_grid:
+            raise ValueError("rasters need the states to be a full grid (LieRaster.states())")
+        nx, ny = len(self.space.x_lines), len(self.space.y_lines)
+        return np.asarray(per_state).reshape(nx, ny).T   # states are x-major; rasters are (row=y, col=x)
+
+    def value_raster(self):
+        return self._grid(self.values)
+
+    def policy_raster(self):
+        return self._grid(self.action)
+
+    def save(self, path):
+        """
+        value.npy (float32) and policy.npy (int16 action index, -1 terminal) rasters plus meta.json,
+        laid out like a LieRaster folder.
+        """
+        os.makedirs(path, exist_ok=True)
+        xs, ys = self.space.x_lines, self.space.y_lines
+        np.save(os.path.join(path, "value.npy"), self.value_raster().astype(np.float32))
+        np.save(os.path.join(path, "policy.npy"), self.policy_raster().astype(np.int16))
+        res = float(xs[1] - xs[0]) if len(xs) > 1 else float(ys[1] - ys[0])
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"transform": [res, 0.0, float(xs[0]), 0.0, res, float(ys[0])],
+                       "actions": [list(a) for a in self.actions], "sweeps": self.sweeps,
+                       "residual": self.residual, "converged": self.converged}, f, indent=2)
+
+
+class _Bellman:
+    """
+    Sparse Bellman backups for a TransitionSet: Q_a = 1 + (C_a @ V_safe) / n_a + p_pen,a * (1 + V).
+    """
+
+    def __init__(self, transitions, penalty):
+        self.counts = transitions.counts
+        self.scale = np.array([1.0 / transitions.samples[club] for club, _ in transitions.actions])
+        self.safe = ~penalty
+        # Probability of a penalty landing, per action and state (fixed, so computed once)
+        self.p_pen = np.stack([(c @ penalty.astype(np.float64)) * s for c, s in zip(self.counts, self.scale)])
+
+    def q(self, values, rows=None, counts=None):
+        """
+        (actions, rows) Q-values from `values`, for every state (rows=None) or the given state indices;
+        `counts` may pass the row subsets of the matrices when they are reused across sweeps.
+        """
+        v_safe = np.where(self.safe, values, 0.0)
+        if rows is None:
+            counts, p_pen, v_here = self.counts, self.p_pen, values
+        else:
+            counts = [c[rows] for c in self.counts] if counts is None else counts
+            p_pen, v_here = self.p_pen[:, rows], values[rows]
+        return np.stack([1.0 + (c @ v_safe) * s for c, s in zip(counts, self.scale)]) + p_pen * (1.0 + v_here)
+
+    def backup(self, values, rows=None, counts=None):
+        q = self.q(values, rows, counts)
+        return q.min(axis=0), q.argmin(axis=0)
+
+
+def solve(space, transitions, terminal_values, method="gauss-seidel", tol=TOL, max_sweeps=MAX_SWEEPS,
+          penalty_lies=PENALTY_LIES, target=None, block_size=BLOCK_SIZE):
+    """
+    Value iteration to a tolerance, then the greedy (argmin) policy.
+
+    Parameters:
+    - space: StateSpace; transitions: TransitionSet over it
+    - terminal_values: V of terminal states (NaN elsewhere), e.g. putting_values()
+    - method: "jacobi", "gauss-seidel" or "prioritized"
+    - tol: stop when the largest value change / Bellman residual is below this
+    - max_sweeps: cap on sweeps (or prioritized batches)
+    - penalty_lies: lies that cost a stroke and replay from the same spot
+    - target: pin used to order Gauss–Seidel blocks (default: transitions.target, else the terminal states' mean)
+    - block_size: states per Gauss–Seidel block / prioritized batch
+
+    Returns:
+    - ValueSolution (a RuntimeWarning is issued, and converged is False, if max_sweeps runs out first)
+    """
+    terminal = ~np.isnan(terminal_values)
+    active = ~terminal
+    bellman = _Bellman(transitions, np.isin(space.lies, list(penalty_lies)))
+    values = np.where(terminal, terminal_values, 0.0)
+
+    if method == "jacobi":
+        for sweep in range(1, max_sweeps + 1):
+            new, _ = bellman.backup(values)
+            residual = np.abs(new - values)[active].max(initial=0.0)
+            values[active] = new[active]
+            if residual < tol:
+                break
+
+    elif method == "gauss-seidel":
+        # Nearest the pin first: values flow backwards from the green, so later blocks see fresh values
+        pin = target if target is not None else transitions.target
+        pin = space.xy[terminal].mean(axis=0) if pin is None else np.asarray(pin, dtype=float)
+        order = np.flatnonzero(active)
+        order = order[np.argsort(np.hypot(*(space.xy[order] - pin).T), kind="stable")]
+        blocks = [order[i:i + block_size] for i in range(0, len(order), block_size)]
+        block_counts = [[c[b] for c in bellman.counts] for b in blocks]   # row subsets, built once
+
+        for sweep in range(1, max_sweeps + 1):
+            residual = 0.0
+            for b, counts in zip(blocks, block_counts):
+                new, _ = bellman.backup(values, b, counts)
+                residual = max(residual, np.abs(new - values[b]).max())
+                values[b] = new
+            if residual < tol:
+                break
+
+    elif method == "prioritized":
+        # Who can land where: the union of every action's pattern, transposed to find predecessors
+        reach = sum((c != 0).astype(np.int16) for c in bellman.counts).T.tocsr()
+        new, _ = bellman.backup(values)
+        priority = np.where(active, np.abs(new - values), 0.0)
+        for sweep in range(1, max_sweeps * max(1, len(space) // block_size) + 1):
+            top = np.argpartition(priority, -min(block_size, len(space)))[-block_size:]
+            top = top[priority[top] >= tol]
+            if not len(top):
+                break
+            values[top] = bellman.backup(values, top)[0]
+            priority[top] = 0.0
+            affected = np.unique(reach[top].indices)
+            affected = affected[active[affected]]
+            if len(affected) > len(space) // 4:
+                # Long clubs reach most of the hole: one full product beats copying most rows out
+                priority = np.where(active, np.abs(bellman.backup(values)[0] - values), 0.0)
+            elif len(affected):
+                priority[affected] = np.abs(bellman.backup(values, affected)[0] - values[affected])
+        residual = priority.max(initial=0.0)
+
+    else:
+        raise ValueError(f"unknown method {method!r} (jacobi, gauss-seidel, prioritized)")
+
+    converged = bool(residual < tol)
+    if not converged:
+        warnings.warn(f"value iteration ({method}) stopped after {sweep} sweeps with residual {residual:.1e} "
+                      f"(tol {tol:.0e}); raise max_sweeps", RuntimeWarning, stacklevel=2)
+
+    _, action = bellman.backup(values)
+    return ValueSolution(space, values, np.where(terminal, -1, action), transitions.actions, sweep, float(residual),
+                         converged)
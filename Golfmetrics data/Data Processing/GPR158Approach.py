@@ -1,46 +1,47 @@
 import pandas as pd
 import numpy as np
 import os
-import matplotlib.pyplot as plt
+import sys
 from sklearn.gaussian_process import GaussianProcessRegressor 
 from sklearn.gaussian_process.kernels import RBF, WhiteKernel
 
+# 💾 Fitted-model artifacts (GPR/gp_artifacts.py): skip sklearn's optimiser when data + settings are unchanged
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_artifacts import load_or_fit, model_from_sklearn
+from shot_bins import ShotBinStore
+from report_renderer import lie_fit_figures, render_reports
+
 lies = ['fairway', 'sand', 'deep_rough', 'rough']  # will handle tee separately
 
 os.makedirs("results", exist_ok=True)
+store = ShotBinStore.load_or_build()
 
 for lie in lies:
     print(f"Processing {lie}...")
 
-    df = pd.read_csv(f"/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_{lie}.csv")
-
-    # Drop rows with missing data just in case
-    df = df.dropna(subset=['holedis', 'shots_to_hole_out'])
-
-    # Filter distances under 250 
-    df = df[df['holedis'] < 250]
-
-    # Bin distances (e.g., every 5 yards)
-    df['bin'] = (df['holedis'] // 5) * 5
-    grouped = df.groupby('bin').agg(
-        avg_strokes=('shots_to_hole_out', 'mean'),
-        count=('shots_to_hole_out', 'count')
-    ).reset_index().rename(columns={'bin': 'holedis'})
-
-    # Remove bins with very few samples 
-    grouped = grouped[grouped['count'] >= 3]
+    # Binned shots from the per-bin store: < 250 yards, 5-yard bins, bins with ≥ 3 shots
+    grouped = store.binned(lie, width=5, hi=249, min_count=3).rename(
+        columns={'dist_bin': 'holedis', 'y_mean': 'avg_strokes', 'n_obs': 'count'})
 
     X = grouped[['holedis']].values
     y = grouped['avg_strokes'].values
 
-    kernel = RBF(length_scale_bounds=(5, 100.0)) + WhiteKernel(noise_level=0.05, noise_level_bounds=(0.05, 1.0))
-    gpr = GaussianProcessRegressor(kernel=kernel, alpha=1e-2, normalize_y=True)
-    gpr.fit(X, y)
+    def fit_gpr():
+        kernel = RBF(length_scale_bounds=(5, 100.0)) + WhiteKernel(noise_level=0.05, noise_level_bounds=(0.05, 1.0))
+        gpr = GaussianProcessRegressor(kernel=kernel, alpha=1e-2, normalize_y=True)
+        gpr.fit(X, y)
+        return model_from_sklearn(gpr)
+
+    # Reuse the saved fit unless this lie's shots or any of these settings changed
+    settings = {"shots": store.digest(lie), "max_dist": 250, "bin": 5, "min_count": 3,
+                "length_scale_bounds": (5, 100.0), "noise_level": 0.05, "noise_level_bounds": (0.05, 1.0), "alpha": 1e-2}
+    model = load_or_fit(f"results/gpr_{lie}_model.npz", [], settings, fit_gpr)
 
-    print(f"Optimised kernel for {lie}: {gpr.kernel_}")
+    print(f"Optimised kernel for {lie}: {model.meta['kernel']}")
 
     X_grid = np.linspace(X.min(), X.max(), 200).reshape(-1, 1)
-    y_pred, std_pred = gpr.predict(X_grid, return_std=True)
+    y_pred, var_pred = model.predict(X_grid[:, 0])
+    std_pred = np.sqrt(var_pred + model.meta["white_noise"])  # same as sklearn's return_std
 
     preds = pd.DataFrame({
         'holedis': X_grid.flatten(),
@@ -49,21 +50,7 @@ for lie in lies:
     })
     preds.to_csv(f"results/gpr_{lie}_preds.csv", index=False)
 
-    # --------- Plot ---------
-    plt.figure(figsize=(8, 5))
-    plt.plot(preds["holedis"], preds["pred"], label="GPR prediction", lw=2)
-    plt.fill_between(preds["holedis"],
-                     preds["pred"] - preds["std"],
-                     preds["pred"] + preds["std"],
-                     color="lightblue", alpha=0.4, label="±1 std. dev")
-    plt.scatter(grouped["holedis"], grouped["avg_strokes"], color="black", s=40, label="Binned avg data")
-    plt.title(f"GPR Prediction - {lie.capitalize()}")
-    plt.xlabel("Distance to hole (yards)")
-    plt.ylabel("Predicted strokes to hole out")
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(f"results/gpr_{lie}_plot.png")
-    plt.close()
+    print(f"Saved predictions for {lie}.\n")
 
-    print(f"Saved predictions and plot for {lie}.\n")
+# 🖼️ Plots: rendered in parallel, skipping any whose predictions and bins are unchanged
+render_reports(lie_fit_figures("results", lies))
@@ -1,44 +1,43 @@
 import pandas as pd
 import numpy as np
 import os
-import matplotlib.pyplot as plt
+import sys
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, WhiteKernel
 
-# Load raw putting data
-df = pd.read_csv("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/green_data_feet/shots_from_green_feet.csv")
+# 💾 Fitted-model artifacts (GPR/gp_artifacts.py): skip sklearn's optimiser when data + settings are unchanged
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_artifacts import load_or_fit, model_from_sklearn
+from shot_bins import ShotBinStore
+from report_renderer import putting_fit_figures, render_reports
 
-# Drop missing values
-df = df.dropna(subset=['holedis', 'shots_to_hole_out'])
-
-# Filter to max 100 feet
-df = df[df['holedis'] <= 90]
-
-# Bin by every 1 foot
-df['bin'] = (df['holedis'] // 1).astype(int)
-
-# Aggregate
-grouped = df.groupby('bin').agg(
-    avg_strokes=('shots_to_hole_out', 'mean'),
-    count=('shots_to_hole_out', 'count')
-).reset_index().rename(columns={'bin': 'feet'})
-
-# Filter out sparse bins
-grouped = grouped[grouped['count'] >= 10]
+# Binned putts from the per-bin store: ≤ 90 feet, 1-foot bins, bins with ≥ 10 putts
+store = ShotBinStore.load_or_build()
+grouped = store.binned("green", width=1, hi=90, min_count=10).rename(
+    columns={'dist_bin': 'feet', 'y_mean': 'avg_strokes', 'n_obs': 'count'})
 
 # Train GPR
 X = grouped[['feet']].values
 y = grouped['avg_strokes'].values
 
-kernel = RBF(length_scale_bounds=(1.0, 20.0)) + WhiteKernel(noise_level=0.01, noise_level_bounds=(1e-4, 0.5))
-gpr = GaussianProcessRegressor(kernel=kernel, alpha=1e-4, normalize_y=True)
-gpr.fit(X, y)
+def fit_gpr():
+    kernel = RBF(length_scale_bounds=(1.0, 20.0)) + WhiteKernel(noise_level=0.01, noise_level_bounds=(1e-4, 0.5))
+    gpr = GaussianProcessRegressor(kernel=kernel, alpha=1e-4, normalize_y=True)
+    gpr.fit(X, y)
+    return model_from_sklearn(gpr)
+
+# Reuse the saved fit unless the putts or any of these settings changed
+settings = {"shots": store.digest("green"), "max_feet": 90, "bin": 1, "min_count": 10,
+            "length_scale_bounds": (1.0, 20.0), "noise_level": 0.01, "noise_level_bounds": (1e-4, 0.5), "alpha": 1e-4}
+model = load_or_fit("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results158code/gpr_green_from_raw_model.npz",
+                    [], settings, fit_gpr)
 
-print(f"Optimised kernel for putting: {gpr.kernel_}")
+print(f"Optimised kernel for putting: {model.meta['kernel']}")
 
 # Predict on grid
 X_grid = np.linspace(X.min(), X.max(), 300).reshape(-1, 1)
-y_pred, std_pred = gpr.predict(X_grid, return_std=True)
+y_pred, var_pred = model.predict(X_grid[:, 0])
+std_pred = np.sqrt(var_pred + model.meta["white_noise"])  # same as sklearn's return_std
 
 # Save predictions
 preds = pd.DataFrame({
@@ -49,19 +48,7 @@ preds = pd.DataFrame({
 os.makedirs("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results158code", exist_ok=True)
 preds.to_csv("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results158code/gpr_green_from_raw_preds.csv", index=False)
 
-# Plot
-plt.figure(figsize=(8, 5))
-plt.plot(preds["feet"], preds["pred"], label="GPR prediction", lw=2, color="green")
-plt.fill_between(preds["feet"], preds["pred"] - preds["std"], preds["pred"] + preds["std"],
-                 color="lightgreen", alpha=0.4, label="±1 std. dev")
-plt.scatter(grouped["feet"], grouped["avg_strokes"], color="black", s=40, label="Binned avg data")
-plt.title("GPR Prediction – Putting (Feet)")
-plt.xlabel("Distance to hole (feet)")
-plt.ylabel("Predicted strokes to hole out")
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.savefig("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results158code/gpr_green_from_raw_plot.png")
-plt.close()
+print("Saved predictions for putting data.")
 
-print("Saved predictions and plot for putting data.")
+# 🖼️ Plot (report_renderer.py): skipped if the predictions and putting bins are unchanged
+render_reports(putting_fit_figures("/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results158code"))
@@ -1,81 +1,43 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
+import sys
+import json
 
-# ----------------------------------------
-# 🧮 RBF Kernel (Radial Basis Function)
-# ----------------------------------------
-# Measures similarity between two input points (distances).
-# The closer x and y are, the higher the value (max = 1 if identical).
-# This controls the "smoothness" of the GP function.
-def rbf_kernel(x, y, sigma):
-    return np.exp(-np.sum((x - y) ** 2) / (2 * sigma ** 2))
-
-
-# ----------------------------------------
-# 🤖 Gaussian Process Regression Function
-# ----------------------------------------
-# Given training data (x, y), noise level, and kernel bandwidth,
-# it computes the posterior predictive distribution over new points.
-def gpreg(x, y, lam, sig, design):
-    n = len(x)  # Number of training observations
-    m = len(design)  # Number of test points (grid over distance)
-
-    # Combine training and prediction points into one big array
-    all_points = np.concatenate((x, design))
-    N = n + m  # Total number of points
-
-    # Build the full kernel (covariance) matrix over all points
-    Sigma = np.zeros((N, N))
-    for i in range(N):
-        for j in range(i, N):
-            k_val = rbf_kernel(np.array([all_points[i]]), np.array([all_points[j]]), lam)
-            Sigma[i, j] = k_val
-            Sigma[j, i] = k_val  # Symmetric matrix
-
-    # Partition the kernel matrix:
-    # S11: cov(train, train)
-    # S12: cov(train, test)
-    # S21: cov(test, train)
-    # S22: cov(test, test)
-    S11 = Sigma[:n, :n]
-    S12 = Sigma[:n, n:]
-    S21 = Sigma[n:, :n]
-    S22 = Sigma[n:, n:]
-
-    # Add noise variance (sig² * I) to training data covariance
-    noise_matrix = sig**2 * np.eye(n)
-
-    # Compute posterior mean: μ* = S21 · (S11 + σ²I)⁻¹ · y
-    inv = S21 @ np.linalg.inv(S11 + noise_matrix)
-    mean = inv @ y
-
-    # Compute posterior covariance: Σ* = S22 - S21 · (S11 + σ²I)⁻¹ · S12
-    cov = S22 - inv @ S12
-    vars = np.diag(cov)  # Only extract variances
-
-    return mean, vars
-
+# 🤖 Shared from-scratch GP engine (GPR/gp_engine.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_batch import fit_batch
+from gp_sparse import SparseGPModel
+from shot_bins import ShotBinStore
+from shot_store import ShotStore
+from report_renderer import render_reports, scratch_figures
 
 # ----------------------------------------
 # 🗂️ File paths and settings
 # ----------------------------------------
 
-# Preprocessed lie-specific shot files (output from your cleaning script)
-lie_files = {
-    "tee": "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_tee.csv",
-    "fairway": "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_fairway.csv",
-    "rough": "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_rough.csv",
-    "sand": "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_sand.csv",
-    "deep_rough": "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/cleaned_shots/all_lies_data/shots_from_deep_rough.csv"
-}
+# Lies to fit (shots come from the columnar shot store written by your cleaning script)
+lies = ["tee", "fairway", "rough", "sand", "deep_rough"]
 
 # 🔧 Hyperparameters for the GP kernel and noise model
 length_scale = 0.3     # Controls how "wiggly" the function is — smaller = more wiggly
 noise_sigma = 0.2      # Assumed noise in shot-to-hole-out values
 
-bin_size = 5         # Yard-wide binning for aggregation
+bin_size = 5         # Yard-wide binning for aggregation (only used for plotting when fitting raw shots)
+
+# 🧪 Fit on every raw shot with the sparse inducing-point GP instead of on the binned averages
+fit_raw_shots = True
+n_inducing = 200       # Cap on automatically placed inducing points
+
+# 📊 Binned fits: use each bin's own noise (within-bin variance / count) instead of one noise_sigma
+use_bin_noise = False
+
+# 🎛️ Tuned hyperparameters from tune_gp_hyperparameters.py override the values above when present
+hyperparameter_file = "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/results/gp_hyperparameters.json"
+tuned = {}
+if os.path.exists(hyperparameter_file):
+    with open(hyperparameter_file) as f:
+        tuned = json.load(f)
 
 # Output folder for your plots
 output_dir = "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/gpr_plots_binned"
@@ -83,37 +45,25 @@ os.makedirs(output_dir, exist_ok=True)
 
 
 # ----------------------------------------
-# 🔁 Loop over each lie and run GPR
+# 🧺 Load and bin each lie
 # ----------------------------------------
 
-for lie, file_path in lie_files.items():
-    # Load CSV for this lie type
-    df = pd.read_csv(file_path)
+store = ShotBinStore.load_or_build()   # per-bin counts / sums, refreshed by cleaning_data.py
 
+prepared = {}
+for lie in lies:
     # FILTER: Limit distance range depending on lie
-    if lie == "tee":
-        df = df[df["holedis"] >= 80]  # For tee shots, keep only ≤ 80 yards
-    else:
-        df = df[df["holedis"] <= 250]  # For all others, keep only ≤ 250 yards
+    # For tee shots, keep only ≥ 80 yards; for all others, keep only ≤ 250 yards
+    lo, hi = (80, None) if lie == "tee" else (None, 250)
+
+    # 📊 Bin means and counts at `bin_size`, dropping sparse bins (e.g., < 5 shots)
+    grouped = store.binned(lie, bin_size, lo=lo, hi=hi, min_count=5)
 
     # Skip if nothing left after filtering
-    if df.empty:
+    if grouped.empty:
         print(f"⚠️ Skipping {lie} — no data in desired distance range.")
         continue
 
-
-    # 🧺 BINNING: round holedis to the nearest lower multiple of `bin_size`
-    df["dist_bin"] = (df["holedis"] // bin_size) * bin_size
-
-    # 📊 GROUP BY BIN: compute mean strokes to hole out and observation count
-    grouped = df.groupby("dist_bin").agg(
-        y_mean=("shots_to_hole_out", "mean"),   # Average strokes in that bin
-        n_obs=("shots_to_hole_out", "count")    # How many shots went into it
-    ).reset_index()
-
-    # 🚫 FILTER: remove sparse bins (e.g., < 5 shots)
-    grouped = grouped[grouped["n_obs"] >= 5]
-
     # 🎯 Set up x and y for GPR (scaled to ~0–1 for stability)
     x = grouped["dist_bin"].values / 300          # Scaled distance
     y = grouped["y_mean"].values                  # Mean strokes
@@ -122,46 +72,66 @@ for lie, file_path in lie_files.items():
     # 🎨 Design grid: evenly spaced test points for prediction
     design = np.linspace(min(x), max(x), 200)
 
-    # 🤖 Run GPR
-    mean, vars = gpreg(x, y, lam=length_scale, sig=noise_sigma, design=design)
+    prepared[lie] = {"range": (lo, hi), "grouped": grouped, "x": x, "y": y, "counts": counts, "design": design}
 
-    # ----------------------------------------
-    # 📈 Plotting the GPR output
-    # ----------------------------------------
 
-    plt.figure(figsize=(10, 6))
-
-    # GP Mean prediction curve
-    plt.plot(design * 300, mean, label='GPR Mean', linewidth=2)
-
-    # Confidence interval (±2 std dev)
-    plt.fill_between(design * 300,
-                     mean - 2 * np.sqrt(vars),
-                     mean + 2 * np.sqrt(vars),
-                     color='lightblue', alpha=0.3,
-                     label='±2 SD')
+# ----------------------------------------
+# 🤖 Run GPR
+# ----------------------------------------
 
-    # Plot binned data: size = how many shots in each bin
-    plt.scatter(grouped["dist_bin"], y,
-                s=counts, alpha=0.8, color='black', label='Binned Averages')
+predictions = {}
+if fit_raw_shots:
+    # Sparse fits on every shot, one lie at a time
+    shots = ShotStore.open_or_build()
+    for lie, data in prepared.items():
+        lo, hi = data["range"]
+        # Only the two columns and the distance range are read from disk
+        df = shots.read(lie, columns=["holedis", "shots_to_hole_out"], min_dist=lo, max_dist=hi)
+        params = tuned.get(lie)
+        # Each shot is its own observation, so the noise is the shot-to-shot spread within a bin
+        raw_x = df["holedis"].values / 300
+        raw_y = df["shots_to_hole_out"].values
+        if params:
+            model = SparseGPModel(raw_x, raw_y, lam=params["length_scale"], sig=params["noise_sigma"],
+                                  amp=params["amp"], mean=params["mean"], n_inducing=n_inducing)
+        else:
+            raw_sigma = np.sqrt(store.pooled_variance(lie, bin_size, lo=lo, hi=hi))
+            model = SparseGPModel(raw_x, raw_y, lam=length_scale, sig=raw_sigma,
+                                  mean=raw_y.mean(), n_inducing=n_inducing)
+        predictions[lie] = model.predict(data["design"])
+else:
+    # Binned fits for all lies in one batched Cholesky solve
+    datasets, params = {}, {}
+    for lie, data in prepared.items():
+        if use_bin_noise:
+            # Noise variance of each bin mean comes straight from the store, so noise_sigma is 1
+            datasets[lie] = (data["x"], data["y"], data["grouped"]["noise_var"].values)
+            params[lie] = {**tuned.get(lie, {"length_scale": length_scale}), "noise_sigma": 1.0}
+        elif lie in tuned:
+            # Tuned noise_sigma is per shot, so a bin average of n shots has variance noise_sigma² / n
+            datasets[lie] = (data["x"], data["y"], 1 / data["counts"])
+            params[lie] = tuned[lie]
+        else:
+            datasets[lie] = (data["x"], data["y"])
+            params[lie] = {"length_scale": length_scale, "noise_sigma": noise_sigma}
+    results = fit_batch(datasets, params, {lie: data["design"] for lie, data in prepared.items()})
+    predictions = {lie: (res.mean, res.var) for lie, res in results.items()}
+
+
+for lie, data in prepared.items():
+    mean, vars = predictions[lie]
+
+    # 💾 Save the fitted curve; the plot is drawn from it by report_renderer.py
+    pd.DataFrame({"holedis": data["design"] * 300, "pred": mean, "std": np.sqrt(vars)}).to_csv(
+        os.path.join(output_dir, f"gpr_{lie}_binned_preds.csv"), index=False)
 
-    # 🧾 Annotate each point with number of shots used (optional)
-    for i, row in grouped.iterrows():
-        plt.text(row["dist_bin"], row["y_mean"] + 0.05,
-                 f"{int(row['n_obs'])}", fontsize=8, ha='center', alpha=0.6)
+    # ✅ Confirm output
+    print(f"✅ Saved predictions for {lie} — using {len(data['grouped'])} distance bins")
 
-    # Labels and layout
-    plt.title(f"GPR (Binned): Shots to Hole Out vs Distance — {lie.replace('_', ' ').title()}")
-    plt.xlabel("Distance to Hole (yards)")
-    plt.ylabel("Shots to Hole Out")
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
 
-    # 💾 Save plot
-    filename = os.path.join(output_dir, f"gpr_{lie}_binned.png")
-    plt.savefig(filename)
-    plt.close()
+# ----------------------------------------
+# 📈 Plotting the GPR output
+# ----------------------------------------
 
-    # ✅ Confirm output
-    print(f"✅ Saved plot for {lie} — using {len(grouped)} distance bins")
+# Rendered in parallel (headless); a lie's plot is skipped if its curve, bins and settings are unchanged
+render_reports(scratch_figures(output_dir, list(prepared), bin_size, "Raw Shots" if fit_raw_shots else "Binned"))
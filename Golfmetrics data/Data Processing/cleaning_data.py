@@ -1,39 +1,15 @@
 import pandas as pd
 import os
+from shot_bins import ShotBinStore
+from shot_store import ShotStoreWriter
 
-# Load your CSV file
+# Load your CSV file (streamed in chunks, so memory is bounded by chunk_size, not the export size)
 file_path = "/Users/federicadomecq/Documents/golfModeL47/Golfmetrics data/ppdatacomplete.csv"
-df = pd.read_csv(file_path)
+chunk_size = 500_000   # rows per chunk
 
-# Create output directories
+# Output directory
 base_dir = "cleaned_shots"
-folders = {
-    "all_lies_data": os.path.join(base_dir, "all_lies_data"),
-    "green_data_yards": os.path.join(base_dir, "green_data_yards"),
-    "green_data_feet": os.path.join(base_dir, "green_data_feet")
-}
-for path in folders.values():
-    os.makedirs(path, exist_ok=True)
-
-# Drop rows with missing essential data
-essential_cols = ['roundid', 'holeid', 'shotid', 'stroke', 'startpos', 'holedis']
-df_clean = df.dropna(subset=essential_cols)
-
-# Convert startpos and stroke to int
-df_clean['startpos'] = df_clean['startpos'].astype(int)
-df_clean['stroke'] = df_clean['stroke'].astype(int)
-
-# Filter out pickup shots and zero/negative distances
-df_clean = df_clean[(df_clean['pickup'] != 1) & (df_clean['holedis'] > 0)]
-
-# Compute shots-to-hole-out
-df_clean["max_stroke_in_hole"] = df_clean.groupby(["roundid", "holeid"])["stroke"].transform("max")
-df_clean["shots_to_hole_out"] = df_clean["max_stroke_in_hole"] - df_clean["stroke"] + 1
-
-# 🔪 Keep only essential columns
-df_clean = df_clean[[
-    "roundid", "holeid", "hnum", "shotid", "stroke", "startpos", "holedis", "shots_to_hole_out"
-]]
+os.makedirs(base_dir, exist_ok=True)
 
 # Map start positions to descriptive names
 lie_names = {
@@ -45,18 +21,71 @@ lie_names = {
     6: "deep_rough"
 }
 
-# Save non-green shots by lie
-all_lies_data = df_clean[df_clean['startpos'] != 4]
-for code, name in lie_names.items():
-    if code == 4:
+
+def clean_rows(df):
+    # Row-by-row filters: the same on any chunk as on the whole file
+
+    # Drop rows with missing essential data
+    essential_cols = ['roundid', 'holeid', 'shotid', 'stroke', 'startpos', 'holedis']
+    df_clean = df.dropna(subset=essential_cols)
+
+    # Convert startpos and stroke to int
+    df_clean = df_clean.astype({'startpos': int, 'stroke': int})
+
+    # Filter out pickup shots and zero/negative distances
+    return df_clean[(df_clean['pickup'] != 1) & (df_clean['holedis'] > 0)]
+
+
+def finish_holes(df_clean):
+    # Only called on complete round/hole groups, so the max is the same as over the whole file
+
+    # Compute shots-to-hole-out
+    df_clean = df_clean.assign(
+        max_stroke_in_hole=df_clean.groupby(["roundid", "holeid"])["stroke"].transform("max"))
+    df_clean["shots_to_hole_out"] = df_clean["max_stroke_in_hole"] - df_clean["stroke"] + 1
+
+    # 🔪 Keep only essential columns
+    return df_clean[[
+        "roundid", "holeid", "hnum", "shotid", "stroke", "startpos", "holedis", "shots_to_hole_out"
+    ]]
+
+
+# 💾 Outputs are written chunk by chunk:
+# - columnar shot store, partitioned by lie (see shot_store.py); green stays in feet, read(..., units="yards") gives yards
+# - per-bin count / sum / sum of squares for the GPR scripts (see shot_bins.py)
+shot_store = ShotStoreWriter(os.path.join(base_dir, "store"), lie_names)
+bin_stats = ShotBinStore()
+
+
+def write(df_done):
+    if len(df_done):
+        shot_store.append(df_done)
+        bin_stats.add_frame(df_done, lie_names)
+
+
+# 🌊 Stream the export, sorted by roundid, holeid. Only the group at the end of a chunk can continue into the
+# next one: it is carried over, and everything before it is complete. The carried rows are checked again at the
+# front of the next chunk, so checking each chunk's keys are non-decreasing also covers the boundary, and a
+# group that reappears further down the file is an error rather than a wrong shots_to_hole_out for both pieces.
+carry = None
+for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+    chunk = clean_rows(chunk)
+    if carry is not None:
+        chunk = pd.concat([carry, chunk])
+    if chunk.empty:
         continue
-    subset = all_lies_data[all_lies_data['startpos'] == code]
-    subset.to_csv(f"{folders['all_lies_data']}/shots_from_{name}.csv", index=False)
 
-# Handle green shots (in feet and yards)
-green = df_clean[df_clean['startpos'] == 4].copy()
-green['holedis_yards'] = green['holedis'] / 3.0
+    roundid, holeid = chunk["roundid"].to_numpy(), chunk["holeid"].to_numpy()
+    r0, r1, h0, h1 = roundid[:-1], roundid[1:], holeid[:-1], holeid[1:]
+    if ((r1 < r0) | ((r1 == r0) & (h1 < h0))).any():
+        raise ValueError("ppdatacomplete.csv must be sorted by roundid, holeid")
+
+    open_group = (roundid == roundid[-1]) & (holeid == holeid[-1])
+    carry = chunk[open_group]
+    write(finish_holes(chunk[~open_group]))
+
+if carry is not None:
+    write(finish_holes(carry))
 
-# Save green shots
-green.to_csv(f"{folders['green_data_feet']}/shots_from_green_feet.csv", index=False)
-green.to_csv(f"{folders['green_data_yards']}/shots_from_green_yards.csv", index=False)
+shot_store.close()
+bin_stats.save(os.path.join(base_dir, "shot_bins.npz"))
@@ -1,10 +1,15 @@
 
-import pandas as pd
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# 🗂️ Shared input catalog (GPR/data_catalog.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+import data_catalog as catalog
 
 # Load data
-df_yards = pd.read_csv("/Users/federicadomecq/Documents/golfModeL47/broadiedata/strokes_by_lie_yards.csv")
-df_green = pd.read_csv("/Users/federicadomecq/Documents/golfModeL47/broadiedata/strokes_on_green_feet.csv")
+df_yards = catalog.broadie_yards()
+df_green = catalog.broadie_feet()
 
 # Plotting strokes vs. distance (yards)
 plt.figure(figsize=(10, 6))
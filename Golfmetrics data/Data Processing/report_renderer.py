@@ -0,0 +1,323 @@
+'''
+One entry point for the GPR and benchmark figures.
+
+Figures are rendered headless (Agg) across a process pool. A figure is skipped when its inputs
+(data files, shot-bin digest, plot settings and the plotting code itself) hash the same as at its last render.
+Keys live in a .render_manifest.json next to the figures.
+
+Usage:
+    python report_renderer.py            # re-render whatever changed in results158code/ and gpr_plots_binned/
+    python report_renderer.py --force    # redraw everything
+'''
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+import data_catalog as catalog
+from gp_artifacts import file_hash
+from parallel import parallel_map
+from shot_bins import ShotBinStore
+
+# === SETTINGS ===
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+RESULTS_DIR = os.path.join(DATA_DIR, "results158code")
+SCRATCH_DIR = os.path.join(DATA_DIR, "gpr_plots_binned")
+MANIFEST_NAME = ".render_manifest.json"
+
+# Bump to force every figure to redraw (e.g. after a matplotlib upgrade)
+RENDER_VERSION = 1
+
+# One figure: render(output, **params) draws it; inputs are the files it reads, digests any other data
+# versions it depends on (e.g. the shot-bin store's per-lie digest)
+Figure = namedtuple("Figure", ["output", "render", "inputs", "params", "digests"], defaults=[()])
+
+
+# ----------------------------------------
+# 🎨 Figures (module-level so the process pool can pickle them)
+# ----------------------------------------
+def _binned(lie, bins):
+    return ShotBinStore.load_or_build().binned(lie, bins["width"], lo=bins.get("lo"), hi=bins.get("hi"),
+                                               min_count=bins["min_count"])
+
+
+def plot_lie_fit(output, preds_path, lie, bins):
+    # GPR158Approach.py: fitted curve ±1 SD over the binned averages
+    preds = pd.read_csv(preds_path)
+    grouped = _binned(lie, bins)
+    plt.figure(figsize=(8, 5))
+    plt.plot(preds["holedis"], preds["pred"], label="GPR prediction", lw=2)
+    plt.fill_between(preds["holedis"],
+                     preds["pred"] - preds["std"],
+                     preds["pred"] + preds["std"],
+                     color="lightblue", alpha=0.4, label="±1 std. dev")
+    plt.scatter(grouped["dist_bin"], grouped["y_mean"], color="black", s=40, label="Binned avg data")
+    plt.title(f"GPR Prediction - {lie.capitalize()}")
+    plt.xlabel("Distance to hole (yards)")
+    plt.ylabel("Predicted strokes to hole out")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+
+
+def plot_putting_fit(output, preds_path, bins):
+    # GPR158Green.py: putting curve in feet
+    preds = pd.read_csv(preds_path)
+    grouped = _binned("green", bins)
+    plt.figure(figsize=(8, 5))
+    plt.plot(preds["feet"], preds["pred"], label="GPR prediction", lw=2, color="green")
+    plt.fill_between(preds["feet"], preds["pred"] - preds["std"], preds["pred"] + preds["std"],
+                     color="lightgreen", alpha=0.4, label="±1 std. dev")
+    plt.scatter(grouped["dist_bin"], grouped["y_mean"], color="black", s=40, label="Binned avg data")
+    plt.title("GPR Prediction – Putting (Feet)")
+    plt.xlabel("Distance to hole (feet)")
+    plt.ylabel("Predicted strokes to hole out")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+
+
+def plot_lie_vs_broadie(output, preds_path, lie):
+    # compare_gpr_with_broadie.py: GPR curve over the Broadie benchmark for one lie
+    df_yards = catalog.broadie_yards()
+    preds = pd.read_csv(preds_path)
+    plt.figure(figsize=(10, 6))
+
+    # Reference stroke curve
+    plt.plot(df_yards["Distance (yards)"], df_yards[lie.capitalize()], label=f"{lie.capitalize()} (Benchmark)", linestyle="--", color="gray")
+
+    # GPR prediction
+    plt.plot(preds["holedis"], preds["pred"], label="GPR Prediction", lw=2)
+    plt.fill_between(preds["holedis"], preds["pred"] - preds["std"], preds["pred"] + preds["std"], alpha=0.3, label="±1 std. dev")
+
+    plt.title(f"GPR vs Benchmark: {lie.capitalize()}")
+    plt.xlabel("Distance to Hole (yards)")
+    plt.ylabel("Predicted Strokes to Hole Out")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+
+
+def plot_putting_vs_broadie(output, preds_path):
+    # greenvsbroadie.py: putting curve over the tour benchmark
+    gpr_df = pd.read_csv(preds_path)
+    benchmark_df = catalog.broadie_feet()
+    benchmark_df.columns = ["feet", "benchmark"]
+
+    plt.figure(figsize=(9, 5))
+    plt.plot(benchmark_df["feet"], benchmark_df["benchmark"], label="Tour Benchmark", color="gray", linestyle="--")
+    plt.plot(gpr_df["feet"], gpr_df["pred"], label="GPR Prediction", color="green", lw=2)
+    plt.fill_between(gpr_df["feet"], gpr_df["pred"] - gpr_df["std"], gpr_df["pred"] + gpr_df["std"],
+                     color="lightgreen", alpha=0.4, label="±1 std. dev")
+    plt.title("Putting Performance vs Tour Benchmark")
+    plt.xlabel("Distance to Hole (feet)")
+    plt.ylabel("Average Strokes to Hole Out")
+    plt.grid(True)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+
+
+def plot_scratch_fit(output, preds_path, lie, bins, fit_label):
+    # GPRonGolfmetricsScratch.py: curve ±2 SD, bins sized and labelled by shot count
+    preds = pd.read_csv(preds_path)
+    grouped = _binned(lie, bins)
+    mean, sd = preds["pred"], preds["std"]
+
+    plt.figure(figsize=(10, 6))
+
+    # GP Mean prediction curve
+    plt.plot(preds["holedis"], mean, label='GPR Mean', linewidth=2)
+
+    # Confidence interval (±2 std dev)
+    plt.fill_between(preds["holedis"],
+                     mean - 2 * sd,
+                     mean + 2 * sd,
+                     color='lightblue', alpha=0.3,
+                     label='±2 SD')
+
+    # Plot binned data: size = how many shots in each bin
+    plt.scatter(grouped["dist_bin"], grouped["y_mean"],
+                s=grouped["n_obs"], alpha=0.8, color='black', label='Binned Averages')
+
+    # 🧾 Annotate each point with number of shots used (optional)
+    for i, row in grouped.iterrows():
+        plt.text(row["dist_bin"], row["y_mean"] + 0.05,
+                 f"{int(row['n_obs'])}", fontsize=8, ha='center', alpha=0.6)
+
+    # Labels and layout
+    plt.title(f"GPR ({fit_label}): Shots to Hole Out vs Distance — {lie.replace('_', ' ').title()}")
+    plt.xlabel("Distance to Hole (yards)")
+    plt.ylabel("Shots to Hole Out")
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(output)
+    plt.close()
+
+
+# ----------------------------------------
+# 🗂️ Figure lists
+# ----------------------------------------
+def _shots_digest(lie):
+    # Binned points come from the shot-bin store, so its per-lie digest is part of the key
+    return ShotBinStore.load_or_build().digest(lie)
+
+
+def lie_fit_figures(results_dir=RESULTS_DIR, lies=("fairway", "sand", "deep_rough", "rough"),
+                    bins={"width": 5, "hi": 249, "min_count": 3}):
+    figures = []
+    for lie in lies:
+        preds = os.path.join(results_dir, f"gpr_{lie}_preds.csv")
+        if os.path.exists(preds):
+            figures.append(Figure(os.path.join(results_dir, f"gpr_{lie}_plot.png"), plot_lie_fit, [preds],
+                                  {"preds_path": preds, "lie": lie, "bins": bins}, [_shots_digest(lie)]))
+    return figures
+
+
+def putting_fit_figures(results_dir=RESULTS_DIR, bins={"width": 1, "hi": 90, "min_count": 10}):
+    preds = os.path.join(results_dir, "gpr_green_from_raw_preds.csv")
+    if not os.path.exists(preds):
+        return []
+    return [Figure(os.path.join(results_dir, "gpr_green_from_raw_plot.png"), plot_putting_fit, [preds],
+                   {"preds_path": preds, "bins": bins}, [_shots_digest("green")])]
+
+
+def benchmark_figures(results_dir=RESULTS_DIR, lies=("tee", "fairway", "rough", "sand", "recovery")):
+    figures = []
+    for lie in lies:
+        preds = os.path.join(results_dir, f"gpr_{lie}_preds.csv")
+        if not os.path.exists(preds):
+            print(f"No GPR file found for {lie}, skipping.")
+            continue
+        figures.append(Figure(os.path.join(results_dir, f"gpr_comparison_{lie}.png"), plot_lie_vs_broadie,
+                              [preds, catalog.BROADIE_YARDS], {"preds_path": preds, "lie": lie}))
+    return figures
+
+
+def putting_benchmark_figures(results_dir=RESULTS_DIR):
+    preds = os.path.join(results_dir, "gpr_green_from_raw_preds.csv")
+    return [Figure(os.path.join(results_dir, "compare_putting_to_benchmark.png"), plot_putting_vs_broadie,
+                   [preds, catalog.BROADIE_FEET], {"preds_path": preds})]
+
+
+def scratch_figures(plot_dir=SCRATCH_DIR, lies=("tee", "fairway", "rough", "sand", "deep_rough"),
+                    bin_size=5, fit_label="Raw Shots"):
+    figures = []
+    for lie in lies:
+        preds = os.path.join(plot_dir, f"gpr_{lie}_binned_preds.csv")
+        if not os.path.exists(preds):
+            continue
+        lo, hi = (80, None) if lie == "tee" else (None, 250)
+        bins = {"width": bin_size, "lo": lo, "hi": hi, "min_count": 5}
+        figures.append(Figure(os.path.join(plot_dir, f"gpr_{lie}_binned.png"), plot_scratch_fit, [preds],
+                              {"preds_path": preds, "lie": lie, "bins": bins, "fit_label": fit_label},
+                              [_shots_digest(lie)]))
+    return figures
+
+
+def all_figures():
+    figures = lie_fit_figures() + putting_fit_figures() + benchmark_figures() + scratch_figures()
+    if os.path.exists(os.path.join(RESULTS_DIR, "gpr_green_from_raw_preds.csv")):
+        figures += putting_benchmark_figures()
+    return figures
+
+
+# ----------------------------------------
+# 🖨️ Rendering
+# ----------------------------------------
+def figure_key(figure):
+    """
+    Hash of everything a figure depends on: input file contents, data digests, parameters and the plotting code.
+    """
+    h = hashlib.sha1(f"v{RENDER_VERSION}".encode())
+    # The whole defining module, so edits to shared helpers (binning, styling) count too
+    h.update(inspect.getsource(inspect.getmodule(figure.render)).encode())
+    h.update(json.dumps(figure.params, sort_keys=True, default=str).encode())
+    for digest in figure.digests:
+        h.update(str(digest).encode())
+    for path in figure.inputs:
+        h.update((file_hash(path) if os.path.exists(path) else "missing").encode())
+    return h.hexdigest()
+
+
+def _render_one(figure):
+    matplotlib.use("Agg")
+    os.makedirs(os.path.dirname(os.path.abspath(figure.output)), exist_ok=True)
+    figure.render(figure.output, **figure.params)
+    return figure.output
+
+
+def _manifest_path(figure):
+    return os.path.join(os.path.dirname(os.path.abspath(figure.output)), MANIFEST_NAME)
+
+
+def render_reports(figures, max_workers=None, force=False):
+    """
+    Render every figure whose key changed (or whose PNG is missing) across a process pool.
+
+    Parameters:
+    - figures: list of Figure
+    - max_workers: pool size (default: one per CPU)
+    - force: redraw everything
+
+    Returns:
+    - list of rendered output paths
+    """
+    manifests = {}
+    for figure in figures:
+        path = _manifest_path(figure)
+        if path not in manifests:
+            manifests[path] = json.load(open(path)) if os.path.exists(path) else {}
+
+    keys = {figure.output: figure_key(figure) for figure in figures}
+    stale = [f for f in figures
+             if force or not os.path.exists(f.output)
+             or manifests[_manifest_path(f)].get(os.path.basename(f.output)) != keys[f.output]]
+    print(f"🖼️ {len(stale)} of {len(figures)} figures changed")
+    if not stale:
+        return []
+
+    rendered = []
+    results = parallel_map(_render_one, [(figure,) for figure in stale], max_workers, return_exceptions=True)
+    for figure, result in zip(stale, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed to render {figure.output}: {result}")
+            continue
+        manifests[_manifest_path(figure)][os.path.basename(figure.output)] = keys[figure.output]
+        rendered.append(figure.output)
+        print(f"✅ Saved {figure.output}")
+
+    for path, manifest in manifests.items():
+        if os.path.isdir(os.path.dirname(path)):
+            with open(path, "w") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+    return rendered
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the GPR / benchmark report figures")
+    parser.add_argument("--force", action="store_true", help="redraw every figure")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    args = parser.parse_args()
+
+    start = time.time()
+    render_reports(all_figures(), max_workers=args.workers, force=args.force)
+    print(f"⏱️ Done in {time.time() - start:.2f}s")
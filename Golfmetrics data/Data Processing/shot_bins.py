@@ -0,0 +1,184 @@
+'''
+Persistent per-lie, per-bin sufficient statistics (count, Σy, Σy²) of shots_to_hole_out.
+
+Shots are accumulated once at a fine base width (1 yard, or 1 foot on the green). Any coarser binning,
+distance filter or minimum-count filter is then a few array sums instead of a full CSV reload + groupby,
+and new shots are folded in O(new rows).
+
+Usage:
+    store = ShotBinStore.load_or_build(STORE_PATH)
+    grouped = store.binned("fairway", width=5, hi=250, min_count=5)
+    store.add_frame(new_shots); store.save(STORE_PATH)
+'''
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from shot_store import ShotStore, lie_names   # green distances are in feet, everything else in yards
+
+# === SETTINGS ===
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STORE_PATH = os.path.join(DATA_DIR, "cleaned_shots", "shot_bins.npz")
+
+
+class ShotBinStore:
+    """
+    Running count / sum / sum of squares of strokes to hole out, per lie and per base bin.
+
+    Base bin i covers distances [i * base_width, (i + 1) * base_width).
+
+    Parameters:
+    - base_width: finest bin width; every width passed to binned() must be a multiple of it
+    """
+
+    def __init__(self, base_width=1):
+        self.base_width = base_width
+        self.stats = {}   # lie → (count, sum, sumsq) arrays indexed by base bin
+        self.batches = []   # content digests of the batches folded in by update_gp_online.py
+
+    # ----------------------------------------
+    # ➕ Accumulate
+    # ----------------------------------------
+    def add(self, lie, holedis, strokes):
+        """
+        Fold new shots of one lie into the store. O(new rows + number of bins).
+
+        Parameters:
+        - lie: lie name
+        - holedis: distances to the hole
+        - strokes: shots to hole out from there
+        """
+        holedis = np.asarray(holedis, dtype=float)
+        strokes = np.asarray(strokes, dtype=float)
+        keep = ~(np.isnan(holedis) | np.isnan(strokes)) & (holedis >= 0)
+        idx = (holedis[keep] // self.base_width).astype(np.int64)
+        strokes = strokes[keep]
+        if len(idx) == 0:
+            return self
+
+        count, total, sumsq = self.stats.get(lie, (np.zeros(0), np.zeros(0), np.zeros(0)))
+        size = max(len(count), idx.max() + 1)
+        new = [np.bincount(idx, weights=w, minlength=size).astype(float) for w in (None, strokes, strokes ** 2)]
+        for arr, old in zip(new, (count, total, sumsq)):
+            arr[:len(old)] += old
+        self.stats[lie] = tuple(new)
+        return self
+
+    def add_frame(self, df, lies=lie_names):
+        """
+        Fold a cleaned-shots DataFrame (startpos, holedis, shots_to_hole_out) into the store.
+        Green rows must be in feet, as in cleaning_data.py.
+        """
+        for code, group in df.groupby("startpos"):
+            if code in lies:
+                self.add(lies[code], group["holedis"].values, group["shots_to_hole_out"].values)
+        return self
+
+    # ----------------------------------------
+    # 📊 Re-aggregate
+    # ----------------------------------------
+    def binned(self, lie, width, lo=None, hi=None, min_count=1):
+        """
+        Bin means, counts and noise for one lie at any multiple of the base width.
+
+        Parameters:
+        - lie: lie name
+        - width: bin width (multiple of base_width)
+        - lo, hi: keep shots with lo <= holedis <= hi (whole base bins, so exact for whole-unit distances)
+        - min_count: drop bins with fewer shots
+
+        Returns:
+        - DataFrame with dist_bin, y_mean, n_obs, y_var (within-bin sample variance) and
+          noise_var (variance of the bin mean, y_var / n_obs)
+        """
+        ratio = width / self.base_width
+        if ratio < 1 or not float(ratio).is_integer():
+            raise ValueError(f"width {width} is not a multiple of the base width {self.base_width}")
+        ratio = int(ratio)
+        count, total, sumsq = self.stats[lie]
+
+        start = 0 if lo is None else max(0, int(np.ceil(lo / self.base_width)))
+        stop = len(count) if hi is None else min(len(count), int(hi // self.base_width) + 1)
+        base = np.arange(start, max(start, stop))
+        groups = base // ratio
+        first = groups[0] if len(groups) else 0
+        sums = [np.bincount(groups - first, weights=arr[base]) for arr in (count, total, sumsq)]
+        n, s, ss = sums if len(groups) else (np.zeros(0),) * 3
+
+        filled = n > 0
+        n, s, ss = n[filled], s[filled], ss[filled]
+        dist_bin = (np.flatnonzero(filled) + first) * width
+        y_mean = s / n
+        dof = n - 1
+        y_var = np.full(len(n), np.nan)
+        y_var[dof > 0] = np.maximum(ss[dof > 0] - s[dof > 0] * y_mean[dof > 0], 0) / dof[dof > 0]
+
+        # Bins of a single shot have no spread of their own, so they get the pooled within-bin variance
+        pooled = np.nansum(y_var * dof) / dof[dof > 0].sum() if (dof > 0).any() else np.nan
+        noise_var = np.where(np.isnan(y_var), pooled, y_var) / n
+
+        grouped = pd.DataFrame({"dist_bin": dist_bin, "y_mean": y_mean, "n_obs": n.astype(int),
+                                "y_var": y_var, "noise_var": noise_var})
+        return grouped[grouped["n_obs"] >= min_count].reset_index(drop=True)
+
+    def pooled_variance(self, lie, width, lo=None, hi=None):
+        """
+        Average within-bin variance of single shots, weighted by degrees of freedom.
+        """
+        grouped = self.binned(lie, width, lo=lo, hi=hi, min_count=2)
+        dof = grouped["n_obs"] - 1
+        return float((grouped["y_var"] * dof).sum() / dof.sum())
+
+    def digest(self, lie):
+        """
+        SHA-1 of one lie's statistics, for keying fitted-model artifacts.
+        """
+        h = hashlib.sha1(str(self.base_width).encode())
+        for arr in self.stats[lie]:
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+
+    # ----------------------------------------
+    # 💾 Save / load
+    # ----------------------------------------
+    def save(self, path=STORE_PATH):
+        arrays = {}
+        for lie, (count, total, sumsq) in self.stats.items():
+            arrays.update({f"{lie}__count": count, f"{lie}__sum": total, f"{lie}__sumsq": sumsq})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, base_width=np.asarray(self.base_width), batches=np.asarray(self.batches, dtype=str),
+                            **arrays)
+
+    @classmethod
+    def load(cls, path=STORE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            store = cls(base_width=data["base_width"].item())
+            store.batches = [str(b) for b in data["batches"]] if "batches" in data.files else []
+            for lie in {name.split("__")[0] for name in data.files if "__" in name}:
+                store.stats[lie] = (data[f"{lie}__count"], data[f"{lie}__sum"], data[f"{lie}__sumsq"])
+        return store
+
+    @classmethod
+    def from_shot_store(cls, shots=None, base_width=1):
+        """
+        Build the store from the columnar shot store written by cleaning_data.py (see shot_store.py).
+        """
+        shots = shots or ShotStore.open_or_build()
+        store = cls(base_width=base_width)
+        for lie in shots.lies:
+            df = shots.read(lie, columns=["holedis", "shots_to_hole_out"])
+            store.add(lie, df["holedis"].values, df["shots_to_hole_out"].values)
+        return store
+
+    @classmethod
+    def load_or_build(cls, path=STORE_PATH):
+        """
+        Load the saved store, building (and saving) it from the cleaned shots on first use.
+        """
+        if os.path.exists(path):
+            return cls.load(path)
+        store = cls.from_shot_store()
+        store.save(path)
+        return store
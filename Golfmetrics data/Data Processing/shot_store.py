@@ -0,0 +1,250 @@
+'''
+Columnar shot store: one folder per lie, one memory-mappable .npy file per column.
+
+Partitions are sorted by holedis, so distance filters (e.g. holedis <= 250) become a binary search plus a
+slice of each memory-mapped column, and only the requested columns are ever read. Green distances are
+stored once, in feet; yards are a derived view (holedis / 3) instead of a second file.
+
+ShotStoreWriter builds the store from chunks with an external merge sort (sorted runs per chunk, merged
+block by block), so building it needs memory for a chunk, not for the whole export.
+
+Usage:
+    store = ShotStore.open_or_build()
+    df = store.read("fairway", columns=["holedis", "shots_to_hole_out"], max_dist=250)
+    putts = store.read("green", units="yards")
+'''
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# === SETTINGS ===
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+STORE_DIR = os.path.join(DATA_DIR, "cleaned_shots", "store")
+
+# Compact on-disk dtypes (ids fit in int32, everything else in a byte)
+SCHEMA = {
+    "roundid": np.int32,
+    "holeid": np.int32,
+    "hnum": np.uint8,
+    "shotid": np.int32,
+    "stroke": np.uint8,
+    "startpos": np.uint8,
+    "holedis": np.float32,
+    "shots_to_hole_out": np.uint8,
+}
+
+# Sentinels for columns that may be missing in the export (hole numbers run 1-18, so 0 means unknown)
+MISSING = {"hnum": 0}
+MERGE_ROWS = 1 << 18   # rows held at a time (across all sorted runs) when ShotStoreWriter.close() merges
+
+# startpos code → lie, same as cleaning_data.py
+lie_names = {0: "tee", 1: "fairway", 2: "rough", 3: "sand", 4: "green", 6: "deep_rough"}
+native_units = {"green": "feet"}   # everything else is in yards
+YARDS_PER_UNIT = {"yards": 1.0, "feet": 1 / 3}
+
+
+def legacy_csv_files(data_dir=DATA_DIR):
+    # Per-lie CSVs written by older versions of cleaning_data.py (green in feet)
+    files = {lie: os.path.join(data_dir, "cleaned_shots", "all_lies_data", f"shots_from_{lie}.csv")
+             for lie in lie_names.values() if lie != "green"}
+    files["green"] = os.path.join(data_dir, "cleaned_shots", "green_data_feet", "shots_from_green_feet.csv")
+    return files
+
+
+class ShotStore:
+    """
+    Read access to a partitioned shot store written by ShotStore.write().
+
+    Parameters:
+    - root: store folder (one sub-folder per lie)
+    """
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        with open(os.path.join(root, "meta.json")) as f:
+            self.meta = json.load(f)
+
+    @property
+    def lies(self):
+        return list(self.meta["partitions"])
+
+    def rows(self, lie):
+        return self.meta["partitions"][lie]["rows"]
+
+    def units(self, lie):
+        return self.meta["partitions"][lie]["units"]
+
+    def column(self, lie, name):
+        """
+        One column of one lie as a read-only memory map (nothing is read until it is sliced).
+        """
+        return np.load(os.path.join(self.root, lie, f"{name}.npy"), mmap_mode="r")
+
+    def read(self, lie, columns=None, min_dist=None, max_dist=None, units=None):
+        """
+        Load one lie's shots.
+
+        Parameters:
+        - lie: lie name (see self.lies)
+        - columns: columns to load (default: all); only these files are touched
+        - min_dist, max_dist: keep min_dist <= holedis <= max_dist, in `units` (pushed down to a slice)
+        - units: "yards" or "feet" for holedis (default: the partition's native units)
+
+        Returns:
+        - DataFrame with the requested columns, in holedis order
+        """
+        native = self.units(lie)
+        units = units or native
+        scale = YARDS_PER_UNIT[native] / YARDS_PER_UNIT[units]   # native → requested units
+        columns = list(SCHEMA) if columns is None else list(columns)
+
+        # 🔎 Predicate pushdown: holedis is sorted, so the range is one contiguous slice
+        holedis = self.column(lie, "holedis")
+        start = 0 if min_dist is None else int(np.searchsorted(holedis, np.float32(min_dist / scale), side="left"))
+        stop = len(holedis) if max_dist is None else int(np.searchsorted(holedis, np.float32(max_dist / scale), side="right"))
+
+        data = {}
+        for name in columns:
+            values = np.array(self.column(lie, name)[start:stop])
+            data[name] = values * np.float32(scale) if name == "holedis" and scale != 1 else values
+        return pd.DataFrame(data)
+
+    # ----------------------------------------
+    # 💾 Write / build
+    # ----------------------------------------
+    @staticmethod
+    def write(df, root=STORE_DIR, lies=lie_names):
+        """
+        Partition cleaned shots by startpos and write each lie's columns with the compact SCHEMA dtypes.
+        Green rows must be in feet, as in cleaning_data.py. Replaces any existing store at `root`.
+        """
+        writer = ShotStoreWriter(root, lies)
+        writer.append(df)
+        return writer.close()
+
+    @classmethod
+    def open_or_build(cls, root=STORE_DIR, data_dir=DATA_DIR):
+        """
+        Open the store, building it once from the legacy per-lie CSVs if cleaning_data.py hasn't written it yet.
+        """
+        if not os.path.exists(os.path.join(root, "meta.json")):
+            frames = [pd.read_csv(path, usecols=list(SCHEMA)) for path in legacy_csv_files(data_dir).values()]
+            cls.write(pd.concat(frames, ignore_index=True), root)
+        return cls(root)
+
+
+class ShotStoreWriter:
+    """
+    Builds a ShotStore incrementally: append() cleaned shots in any number of chunks, then close().
+
+    Each append() sorts its rows of every lie by holedis and adds them to raw per-column files as one sorted
+    run. close() merges the runs block by block (an external merge sort), so memory stays bounded by the
+    chunk size and `merge_rows` rather than by the whole export. Ties keep their arrival order, exactly as
+    a stable sort of everything would.
+
+    Parameters:
+    - root: store folder to (re)place
+    - lies: startpos code → lie name
+    - merge_rows: rows read per merge step, shared across the runs
+    """
+
+    def __init__(self, root=STORE_DIR, lies=lie_names, merge_rows=MERGE_ROWS):
+        self.root = root
+        self.lies = lies
+        self.merge_rows = merge_rows
+        self.tmp = root + ".tmp"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        os.makedirs(self.tmp)
+        self.rows = {}
+        self.runs = {}   # lie → row offsets where each sorted run starts
+
+    def _raw(self, lie, name):
+        return os.path.join(self.tmp, lie, f"{name}.raw")
+
+    def append(self, df):
+        for code, group in df.groupby("startpos"):
+            if code not in self.lies:
+                continue
+            lie = self.lies[code]
+            if lie not in self.rows:
+                os.makedirs(os.path.join(self.tmp, lie))
+                self.rows[lie] = 0
+                self.runs[lie] = []
+            order = np.argsort(group["holedis"].to_numpy(dtype=SCHEMA["holedis"]), kind="stable")
+            for name, dtype in SCHEMA.items():
+                values = group[name]
+                if name in MISSING:
+                    values = values.fillna(MISSING[name])
+                with open(self._raw(lie, name), "ab") as f:
+                    f.write(values.to_numpy(dtype=dtype)[order].tobytes())
+            self.runs[lie].append(self.rows[lie])
+            self.rows[lie] += len(group)
+
+    def _merge(self, lie):
+        """
+        k-way merge of one lie's sorted runs into its .npy columns, at most merge_rows rows in memory at a time
+        (split evenly across the runs still being read).
+        """
+        rows = self.rows[lie]
+        raw = {name: np.memmap(self._raw(lie, name), dtype=dtype, mode="r", shape=(rows,))
+               for name, dtype in SCHEMA.items()}
+        out = {name: np.lib.format.open_memmap(os.path.join(self.tmp, lie, f"{name}.npy"), mode="w+",
+                                               dtype=dtype, shape=(rows,))
+               for name, dtype in SCHEMA.items()}
+        holedis = raw["holedis"]
+        pos = np.array(self.runs[lie], dtype=np.int64)         # next unread row of each run
+        end = np.append(pos[1:], rows)
+        written = 0
+
+        def emit(pieces, order=None):
+            nonlocal written
+            n = sum(b - a for a, b in pieces)
+            for name in SCHEMA:
+                values = np.concatenate([raw[name][a:b] for a, b in pieces])
+                out[name][written:written + n] = values if order is None else values[order]
+            written += n
+
+        while (pos < end).any():
+            live = np.flatnonzero(pos < end)
+            step = max(1, self.merge_rows // len(live))
+            # No run can hold a value below the cutoff beyond its next `step` rows
+            cutoff = min(holedis[min(pos[r] + step, end[r]) - 1] for r in live)
+
+            # Everything strictly below the cutoff, merged stably (run order breaks ties, as arrival order)
+            below = [(pos[r], pos[r] + int(np.searchsorted(holedis[pos[r]:min(pos[r] + step, end[r])],
+                                                           cutoff, side="left"))) for r in live]
+            if any(b > a for a, b in below):
+                keys = np.concatenate([holedis[a:b] for a, b in below])
+                emit(below, np.argsort(keys, kind="stable"))
+                for r, (_, b) in zip(live, below):
+                    pos[r] = b
+
+            # Then every row equal to the cutoff, run by run (already in stable order)
+            for r in live:
+                stop = pos[r] + int(np.searchsorted(holedis[pos[r]:end[r]], cutoff, side="right"))
+                for a in range(pos[r], stop, self.merge_rows):
+                    emit([(a, min(a + self.merge_rows, stop))])
+                pos[r] = stop
+
+        for column in out.values():
+            column.flush()
+        del raw, out
+        for name in SCHEMA:
+            os.remove(self._raw(lie, name))
+
+    def close(self):
+        partitions = {}
+        for lie in [lie for lie in self.lies.values() if lie in self.rows]:   # startpos order
+            self._merge(lie)
+            partitions[lie] = {"rows": self.rows[lie], "units": native_units.get(lie, "yards")}
+
+        with open(os.path.join(self.tmp, "meta.json"), "w") as f:
+            json.dump({"schema": {name: np.dtype(dtype).name for name, dtype in SCHEMA.items()},
+                       "missing": MISSING, "sorted_by": "holedis", "partitions": partitions}, f, indent=2)
+        # Swap in the finished store so readers never see a half-written one
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.replace(self.tmp, self.root)
+        return ShotStore(self.root)
@@ -0,0 +1,58 @@
+'''
+Tune the from-scratch GP hyperparameters for every lie + putting by maximising the marginal likelihood.
+Writes gp_hyperparameters.json, which GPRonGolfmetricsScratch.py picks up instead of its hardcoded values.
+'''
+import os
+import sys
+import json
+import time
+
+# 🤖 From-scratch GP hyperparameter fitter (GPR/gp_hyperopt.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_hyperopt import fit_all
+from shot_bins import ShotBinStore
+
+# === SETTINGS ===
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+OUTPUT_JSON = os.path.join(DATA_DIR, "results", "gp_hyperparameters.json")
+
+lies = ["tee", "fairway", "rough", "sand", "deep_rough"]
+bin_size = 5          # yards (same binning as GPRonGolfmetricsScratch.py)
+min_count = 5
+x_scale = 300         # distances scaled to ~0–1
+
+putt_bin_size = 1     # feet
+putt_min_count = 10
+putt_x_scale = 90
+
+
+if __name__ == "__main__":
+    # === Build one binned dataset per lie (+ putting) ===
+    # Bin means with noise weights 1/count: a bin average of n shots has variance σ²/n
+    store = ShotBinStore.load_or_build()
+    datasets = {}
+    scales = {}
+    for lie in lies:
+        lo, hi = (80, None) if lie == "tee" else (None, 250)
+        grouped = store.binned(lie, bin_size, lo=lo, hi=hi, min_count=min_count)
+        datasets[lie] = (grouped["dist_bin"].values / x_scale, grouped["y_mean"].values, 1 / grouped["n_obs"].values)
+        scales[lie] = x_scale
+
+    grouped = store.binned("green", putt_bin_size, hi=90, min_count=putt_min_count)
+    datasets["green"] = (grouped["dist_bin"].values / putt_x_scale, grouped["y_mean"].values, 1 / grouped["n_obs"].values)
+    scales["green"] = putt_x_scale
+
+    # === Fit all datasets concurrently ===
+    start = time.time()
+    tuned = fit_all(datasets, n_restarts=8)
+    print(f"⏱️ Tuned {len(tuned)} datasets in {time.time() - start:.2f}s")
+
+    for name, params in tuned.items():
+        params["x_scale"] = scales[name]
+        print(f"{name}: length_scale={params['length_scale']:.3f}, noise_sigma={params['noise_sigma']:.3f}, "
+              f"amp={params['amp']:.3f}, lml={params['lml']:.1f}")
+
+    os.makedirs(os.path.dirname(OUTPUT_JSON), exist_ok=True)
+    with open(OUTPUT_JSON, "w") as f:
+        json.dump(tuned, f, indent=2)
+    print(f"✅ Saved hyperparameters to {OUTPUT_JSON}")
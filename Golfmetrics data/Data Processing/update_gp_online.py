@@ -0,0 +1,113 @@
+'''
+Nightly ingest: fold a new batch of cleaned shots into the per-lie ESHO curves without refitting.
+Each batch's bin averages are appended to an online GP (rank-k Cholesky update); the oldest bins
+fall out of the sliding window. Every artifact records the content digests of the batches it holds,
+so re-running the same batch is a no-op instead of counting its shots twice.
+
+Usage: python update_gp_online.py new_shots.csv
+(new_shots.csv has the cleaned_shots columns: startpos, holedis, shots_to_hole_out, ...)
+'''
+import os
+import sys
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# 🤖 From-scratch GP modules (GPR/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_online import OnlineGPModel
+from gp_artifacts import file_hash, load_model, save_model
+from shot_bins import ShotBinStore
+
+# === SETTINGS ===
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MODEL_DIR = os.path.join(DATA_DIR, "results", "gp_online")
+HYPERPARAMETER_FILE = os.path.join(DATA_DIR, "results", "gp_hyperparameters.json")
+
+# startpos code → lie, same as cleaning_data.py (green is fitted in feet)
+lie_names = {0: "tee", 1: "fairway", 2: "rough", 3: "sand", 6: "deep_rough", 4: "green"}
+bin_size = {"green": 1}     # feet on the green, yards elsewhere
+default_bin_size = 5
+x_scale = {"green": 90}
+default_x_scale = 300
+max_points = 3000           # sliding window, in bins (~60 nightly batches per lie)
+
+# Used only when no tuned hyperparameters exist yet
+length_scale = 0.3
+noise_sigma = 0.7           # per shot
+
+
+def distance_range(lie):
+    # Same distance ranges as GPRonGolfmetricsScratch.py / GPR158Green.py
+    if lie == "tee":
+        return 80, None
+    if lie == "green":
+        return None, 90
+    return None, 250
+
+
+def bin_batch(lie, store):
+    # Bin averages of one lie; a bin of n shots gets noise sd noise_sigma / √n
+    lo, hi = distance_range(lie)
+    grouped = store.binned(lie, bin_size.get(lie, default_bin_size), lo=lo, hi=hi)
+    return grouped["dist_bin"].values / x_scale.get(lie, default_x_scale), grouped["y_mean"].values, grouped["n_obs"].values
+
+
+if __name__ == "__main__":
+    new_shots = pd.read_csv(sys.argv[1])
+    batch_digest = file_hash(sys.argv[1])
+    store = ShotBinStore.load_or_build()                    # every shot ingested so far
+    batch_store = ShotBinStore().add_frame(new_shots, lie_names)
+    tuned = {}
+    if os.path.exists(HYPERPARAMETER_FILE):
+        with open(HYPERPARAMETER_FILE) as f:
+            tuned = json.load(f)
+
+    for lie in lie_names.values():
+        start = time.time()
+        model_path = os.path.join(MODEL_DIR, f"gpr_{lie}_online.npz")
+        params = tuned.get(lie, {"length_scale": length_scale, "noise_sigma": noise_sigma})
+        shot_sigma = params["noise_sigma"]
+
+        seeded = not os.path.exists(model_path)
+        if not seeded:
+            model, _ = load_model(model_path)
+            batches = model.meta.get("batches", [])
+            if batch_digest in batches:
+                print(f"⏭️ {lie}: batch already ingested, skipping")
+                continue
+        else:
+            # First run: seed the online model from all shots so far
+            x, y, counts = bin_batch(lie, store)
+            model = OnlineGPModel(x, y, params["length_scale"], shot_sigma / np.sqrt(counts),
+                                  amp=params.get("amp", 1.0), mean=params.get("mean", np.average(y, weights=counts)),
+                                  jitter=1e-8, max_points=max_points)
+            batches = list(store.batches)
+
+        # 🔁 Rank-k update with tonight's bins (a seed from a store that already holds them has them)
+        n_new = 0
+        if batch_digest not in batches:
+            if lie in batch_store.stats:
+                x, y, counts = bin_batch(lie, batch_store)
+                n_new = counts.sum()
+                if len(x):
+                    model.add(x, y, sig_new=shot_sigma / np.sqrt(counts))
+            batches = batches + [batch_digest]
+
+        save_model(model, model_path, key="online", meta={"batches": batches})
+
+        # Refresh the ESHO curve on the usual 200-point grid
+        scale = x_scale.get(lie, default_x_scale)
+        design = np.linspace(model.x.min(), model.x.max(), 200)
+        mean, vars = model.predict(design)
+        pd.DataFrame({"holedis": design * scale, "pred": mean, "std": np.sqrt(vars)}).to_csv(
+            os.path.join(MODEL_DIR, f"gpr_{lie}_online_preds.csv"), index=False)
+
+        print(f"✅ {lie}: {n_new} new shots, {len(model.y)} bins in window ({time.time() - start:.2f}s)")
+
+    # 📊 Fold tonight's shots into the per-bin store for the next run / the batch GPR scripts (once)
+    if batch_digest not in store.batches:
+        store.add_frame(new_shots, lie_names)
+        store.batches.append(batch_digest)
+        store.save()
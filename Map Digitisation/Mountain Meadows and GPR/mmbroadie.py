@@ -1,46 +1,34 @@
-import pandas as pd
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
-from shapely import wkt
-from shapely.geometry import Point, MultiPolygon, Polygon
-from shapely.ops import unary_union
-from shapely.affinity import rotate
+from shapely.geometry import MultiPolygon, Polygon
 from matplotlib.colors import Normalize
 from matplotlib.cm import ScalarMappable
 
-# === Load data ===
-df = pd.read_csv("Map Digitisation/Mountain Meadows/dataMM/golf_holes_full.csv")
-df["geometry"] = df["WKT"].apply(wkt.loads)
+# 📈 Dense expected-strokes tables (GPR/expected_strokes.py) + shared input catalog (GPR/data_catalog.py) + lie index
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from expected_strokes import ExpectedStrokesTable, encode_lies, NO_LIE
+import data_catalog as catalog
+from course_index import CourseLieIndex
+from hole_frames import course_frames
 
-df["lie"] = df["lie"].str.strip().str.lower()
-
-
-lines = pd.read_csv("Map Digitisation/Mountain Meadows/dataMM/hole_lines.csv")
-lines["geometry"] = lines["WKT"].apply(wkt.loads)
+# === Load data (parsed geometry is cached per machine) ===
+df = catalog.course_features()
 
+df["lie"] = df["lie"].str.strip().str.lower()
 
-yards = pd.read_csv("broadiedata/strokes_by_lie_yards_broadie.csv")
-feet = pd.read_csv("broadiedata/strokes_on_green_feet_broadie.csv")
-feet["Distance (yards)"] = feet["Distance (feet)"] / 3
-feet = feet.drop(columns=["Distance (feet)"])
-green_interp = pd.Series(feet["Green"].values, index=feet["Distance (yards)"].values)
 
-yard_interp = {
-    col.lower(): pd.Series(yards[col].values, index=yards["Distance (yards)"])
-    for col in ["Tee", "Fairway", "Rough", "Sand", "Recovery"]
-}
-yard_interp["green"] = green_interp
+# Built once per run from the Broadie CSVs; lookups are pure array indexing
+strokes_table = ExpectedStrokesTable.from_broadie()
 
 # === Set hole ===
 hole = 1
 hole_df = df[df["hole_ref"] == hole].copy()
-line_geom = lines[lines["ref"] == hole]["geometry"].values[0]
-p1, p2 = line_geom.coords[0], line_geom.coords[1]
-angle = 90 - np.degrees(np.arctan2(p2[1] - p1[1], p2[0] - p1[0]))
-hole_df["geometry"] = hole_df["geometry"].apply(lambda g: rotate(g, angle, origin=p1))
 
-green_union = unary_union(hole_df[hole_df["lie"] == "green"]["geometry"].tolist())
-pin = green_union.centroid
+# Precomputed frames (GPR/hole_frames.py): world → hole-up is one affine matrix, pin = green centroid there
+frame = course_frames()[hole]
+hole_df["geometry"] = frame.transform_geometries(hole_df["geometry"].to_numpy(), "world", "hole")
 
 # === Radial grid (centered at pin) ===
 r_vals = np.linspace(0, 150, 300)
@@ -49,56 +37,25 @@ R, T = np.meshgrid(r_vals, theta_vals)
 X = R * np.cos(T)
 Y = R * np.sin(T)
 
-# === Utility functions ===
-def lookup_lie(x, y):
-    point = Point(x + pin.x, y + pin.y)
-
-    # Convert "bunker" to "sand", ignore "water_hazard", "OB", etc.
-    lie_map = {
-        "green": "green",
-        "fairway": "fairway",
-        "rough": "rough",
-        "bunker": "sand",
-        "tee": "tee"
-    }
-
-    for raw_lie, mapped_lie in lie_map.items():
-        matches = hole_df[hole_df["lie"] == raw_lie]
-        if any(geom.contains(point) for geom in matches["geometry"]):
-            return mapped_lie
-    return None
-
-
-
-def get_strokes(r, lie):
-    if lie:
-        val = get_strokes(r, lie)
-    if np.isnan(val):
-        print(f"⚠ NaN stroke value at r={r:.1f}, lie={lie}")
-        Z[i, j] = val
-    else:
-        print(f"⛔ No lie found at x={x:.1f}, y={y:.1f}")
-
-    if lie not in yard_interp:
-        return np.nan
-    series = yard_interp[lie].interpolate(method="linear", limit_direction="both")
-    return series.reindex([r], method="nearest").iloc[0]
-
-def is_inside_course(x, y):
-    pt = Point(x + pin.x, y + pin.y)
-    return any(g.contains(pt) for g in hole_df["geometry"])
+# === Lie lookup (GPR/course_index.py): every grid cell classified in one call ===
+# Overlaps go to the more specific lie (green > bunker > water > fairway > rough); "bunker" counts as "sand",
+# and water_hazard, OB and anything else gets no strokes value
+lie_index = CourseLieIndex.from_frame(hole_df)
+lie_map = {
+    "green": "green",
+    "fairway": "fairway",
+    "rough": "rough",
+    "bunker": "sand",
+    "tee": "tee"
+}
 
 # === Compute Z values (masked to course features) ===
-Z = np.full_like(R, np.nan)
-for i in range(R.shape[0]):
-    for j in range(R.shape[1]):
-        x, y = X[i, j], Y[i, j]
-        if not is_inside_course(x, y):
-            continue
-        r = R[i, j]
-        lie = lookup_lie(x, y)
-        if lie:
-            Z[i, j] = get_strokes(r, lie)
+# Classify every cell first, then look up all strokes in one vectorised call
+cell_lies = lie_index.lie_of(*frame.transform(X, Y, "pin", "hole"))
+codes = np.full(R.shape, NO_LIE, dtype=np.uint8)
+for raw_lie, mapped_lie in lie_map.items():
+    codes[cell_lies == raw_lie] = encode_lies([mapped_lie])[0]
+Z = strokes_table.lookup(R, codes)
 
 # === Plot ===
 fig, ax = plt.subplots(figsize=(8, 8))
@@ -110,12 +67,10 @@ for radius in range(10, 160, 10):
     ax.add_patch(plt.Circle((0, 0), radius, color='black', fill=False, lw=0.5, ls='--', alpha=0.4))
 
 # Draw course outlines
-for _, row in hole_df.iterrows():
-    geom = row["geometry"]
+for geom in frame.transform_geometries(hole_df["geometry"].to_numpy(), "hole", "pin"):
     parts = geom.geoms if isinstance(geom, MultiPolygon) else [geom]
     for poly in parts:
-        x = np.array(poly.exterior.xy[0]) - pin.x
-        y = np.array(poly.exterior.xy[1]) - pin.y
+        x, y = poly.exterior.xy
         ax.plot(x, y, color='black', linewidth=0.7)
 
 # Draw pin marker
@@ -1,6 +1,9 @@
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
 import os
+import sys
+
+# 🧩 Mosaic builder (course_mosaic.py): pastes each hole straight into the output buffer, no matplotlib re-render
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from course_mosaic import build_mosaic, build_pyramid
 '''
 Join hole layouts into 1
 '''
@@ -12,24 +15,16 @@ output_file = "course_all_holes_yardagealigned.png"
 # Choose which holes to include (skip 0 if it exists)
 hole_nums = [i for i in range(1, 19)]  # hole 1 through 18
 
-# Load images
-images = [mpimg.imread(os.path.join(folder, f"/Users/federicadomecq/Desktop/Golf ModeL/Map Digitisation/Mountain Meadows/Mountain Meadows Images and Layouts/YardageAligned/hole_{i}_yards.png")) for i in hole_nums]
+# Hole images (only their headers are read up front; each is decoded when it is placed)
+images = [os.path.join(folder, f"/Users/federicadomecq/Desktop/Golf ModeL/Map Digitisation/Mountain Meadows/Mountain Meadows Images and Layouts/YardageAligned/hole_{i}_yards.png") for i in hole_nums]
 
 # Grid size (adjust as needed)
 cols = 6
-rows = -(-len(images) // cols)  # ceiling division
-
-# Create the figure
-fig, axes = plt.subplots(rows, cols, figsize=(cols * 4, rows * 4))
 
-for i, ax in enumerate(axes.flat):
-    if i < len(images):
-        ax.imshow(images[i])
-        ax.set_title(f"Hole {hole_nums[i]}")
-        ax.axis('off')
-    else:
-        ax.axis('off')  # hide unused axes
+downsample = 1         # e.g. 2 → half-resolution overview
+pyramid_dir = None     # e.g. os.path.join(folder, "course_tiles") for a zoomable tile pyramid
 
-plt.tight_layout()
-plt.savefig(os.path.join(folder, output_file), dpi=300)
-plt.close()
+mosaic = build_mosaic(images, os.path.join(folder, output_file), cols=cols, downsample=downsample,
+                      labels=[f"Hole {i}" for i in hole_nums])
+if pyramid_dir:
+    build_pyramid(mosaic, pyramid_dir)
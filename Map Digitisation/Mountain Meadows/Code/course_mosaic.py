@@ -0,0 +1,147 @@
+'''
+Course overview mosaics built straight from the hole PNGs.
+
+Each hole image is decoded once, optionally downsampled while decoding (Image.reduce), and pasted into a
+preallocated output buffer, one hole at a time. With buffer_path the buffer is a memory-mapped .npy on
+disk, so memory stays at one hole image however many holes (or courses) the mosaic holds (encoding the
+flat PNG output still needs the whole image; the tile pyramid does not). No matplotlib figure is involved,
+so nothing is resampled twice.
+
+build_pyramid() cuts the mosaic into 256 px tiles at successively halved resolutions
+(level 0 = full size), averaging 2×2 blocks one strip of rows at a time.
+
+Usage:
+    mosaic = build_mosaic([f"YardageAligned/hole_{i}_yards.png" for i in range(1, 19)],
+                          "course_all_holes_yardagealigned.png", labels=[f"Hole {i}" for i in range(1, 19)])
+    build_pyramid(mosaic, "course_tiles")
+'''
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# === SETTINGS ===
+LABEL_HEIGHT = 40     # px strip above each hole for its title (at full resolution)
+TILE_SIZE = 256
+STRIP_ROWS = 512      # rows averaged at a time when building pyramid levels
+
+
+def _allocate(shape, buffer_path=None):
+    # White canvas, in RAM or memory-mapped on disk
+    if buffer_path is None:
+        return np.full(shape, 255, dtype=np.uint8)
+    buf = np.lib.format.open_memmap(buffer_path, mode="w+", dtype=np.uint8, shape=shape)
+    for start in range(0, shape[0], STRIP_ROWS):
+        buf[start:start + STRIP_ROWS] = 255
+    return buf
+
+
+def _load_rgb(path, downsample):
+    with Image.open(path) as im:
+        if im.mode in ("RGBA", "LA", "P"):
+            # Flatten transparency onto white, like the saved figures' background
+            canvas = Image.new("RGBA", im.size, "white")
+            canvas.alpha_composite(im.convert("RGBA"))
+            rgb = canvas.convert("RGB")
+        else:
+            rgb = im.convert("RGB")
+    # reduce() only accepts the plain modes, so it runs after the conversion
+    if downsample > 1:
+        rgb = rgb.reduce(downsample)
+    return np.asarray(rgb)
+
+
+def build_mosaic(image_paths, output=None, cols=6, downsample=1, labels=None, buffer_path=None):
+    """
+    Place hole images on a grid, one image in memory at a time.
+
+    Parameters:
+    - image_paths: hole PNGs in grid order (row by row)
+    - output: PNG to write (optional; None just returns the buffer)
+    - cols: grid columns
+    - downsample: integer reduction factor applied while decoding (2 → half width and height)
+    - labels: optional title per image, drawn above it
+    - buffer_path: .npy file to memory-map the mosaic into (default: in RAM)
+
+    Returns:
+    - mosaic as an (H, W, 3) uint8 array (a memmap when buffer_path is given)
+    """
+    # Cell size from the PNG headers alone (nothing is decoded yet)
+    sizes = []
+    for path in image_paths:
+        with Image.open(path) as im:
+            sizes.append(im.size)
+    # reduce() rounds partial blocks up, so the cell must too
+    cell_w = -(-max(w for w, _ in sizes) // downsample)
+    cell_h = -(-max(h for _, h in sizes) // downsample)
+    label_h = LABEL_HEIGHT // downsample if labels else 0
+    rows = -(-len(image_paths) // cols)  # ceiling division
+
+    mosaic = _allocate((rows * (cell_h + label_h), cols * cell_w, 3), buffer_path)
+
+    for i, path in enumerate(image_paths):
+        r, c = divmod(i, cols)
+        top, left = r * (cell_h + label_h), c * cell_w
+
+        if labels:
+            strip = Image.new("RGB", (cell_w, label_h), "white")
+            ImageDraw.Draw(strip).text((cell_w // 2, label_h // 2), labels[i], fill="black", anchor="mm",
+                                       font_size=max(8, int(label_h * 0.6)))
+            mosaic[top:top + label_h, left:left + cell_w] = np.asarray(strip)
+
+        # Centre the hole in its cell
+        tile = _load_rgb(path, downsample)
+        h, w = tile.shape[:2]
+        y0, x0 = top + label_h + (cell_h - h) // 2, left + (cell_w - w) // 2
+        mosaic[y0:y0 + h, x0:x0 + w] = tile
+
+    if isinstance(mosaic, np.memmap):
+        mosaic.flush()
+    if output:
+        Image.fromarray(np.asarray(mosaic)).save(output)
+    return mosaic
+
+
+def _halve(level, buffer_path=None):
+    # 2×2 block mean, one strip of rows at a time (odd edges are padded by repeating the last row/column)
+    H, W = level.shape[:2]
+    out = _allocate(((H + 1) // 2, (W + 1) // 2, 3), buffer_path)
+    step = STRIP_ROWS - STRIP_ROWS % 2
+    for start in range(0, H, step):
+        block = np.asarray(level[start:start + step], dtype=np.uint16)
+        if block.shape[0] % 2:
+            block = np.concatenate([block, block[-1:]])
+        if W % 2:
+            block = np.concatenate([block, block[:, -1:]], axis=1)
+        out[start // 2:(start + len(block)) // 2] = (
+            (block[0::2, 0::2] + block[1::2, 0::2] + block[0::2, 1::2] + block[1::2, 1::2] + 2) // 4)
+    return out
+
+
+def build_pyramid(mosaic, out_dir, tile_size=TILE_SIZE, use_memmap=False):
+    """
+    Write a multi-resolution tile pyramid: out_dir/{level}/{row}_{col}.png, level 0 at full resolution,
+    each further level at half the previous one, until the whole mosaic fits in one tile.
+
+    Parameters:
+    - mosaic: (H, W, 3) uint8 array or memmap (e.g. from build_mosaic)
+    - out_dir: pyramid folder
+    - tile_size: tile edge in px
+    - use_memmap: keep intermediate levels on disk (out_dir/level_{n}.npy) instead of in RAM
+
+    Returns:
+    - number of levels written
+    """
+    level, n = mosaic, 0
+    while True:
+        level_dir = os.path.join(out_dir, str(n))
+        os.makedirs(level_dir, exist_ok=True)
+        H, W = level.shape[:2]
+        for row, y in enumerate(range(0, H, tile_size)):
+            for col, x in enumerate(range(0, W, tile_size)):
+                Image.fromarray(np.asarray(level[y:y + tile_size, x:x + tile_size])).save(
+                    os.path.join(level_dir, f"{row}_{col}.png"))
+        if H <= tile_size and W <= tile_size:
+            return n + 1
+        n += 1
+        level = _halve(level, os.path.join(out_dir, f"level_{n}.npy") if use_memmap else None)
@@ -0,0 +1,196 @@
+'''
+Hole layout renderer shared by the layout scripts.
+
+Each hole is drawn as one PolyCollection per lie (instead of one ax.fill per polygon part) and the 18 holes
+are rendered in parallel worker processes with the headless Agg backend. The four layouts the scripts used
+to produce are options of one entry point:
+
+    "true"       lon/lat as digitised, plus the OB / water that touches the hole   (allmountainmeadows.py)
+    "yardage"    golf_holes_yardage.csv, yards, tee → green up the y axis          (longlattoyards.py)
+    "upward"     lon/lat rotated about the tee so the hole line points up          (upwardsmountainmeadows.py)
+    "separated"  yardage layout written to one folder per hole, with its CSV       (rotate_and_export_by_hole.py)
+
+Usage:
+    features = export_layouts("upward", "Mountain Meadows Layouts/Upwards")
+'''
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import shapely
+from matplotlib.collections import PolyCollection
+from shapely.ops import unary_union
+
+# 🗂️ Shared input catalog (GPR/data_catalog.py) + per-hole frames (GPR/hole_frames.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "GPR"))
+import data_catalog as catalog
+from hole_frames import course_frames
+from parallel import parallel_map
+
+# === Color mapping ===
+lie_colors = {
+    "bunker": "tan",
+    "fairway": "forestgreen",
+    "green": "lightgreen",
+    "OB": "lightcoral",
+    "rough": "mediumseagreen",
+    "tee": "darkgreen",
+    "water_hazard": "skyblue"
+}
+
+# === Layout styles ===
+_legend_outside = dict(loc="center left", bbox_to_anchor=(1.02, 0.5))
+_yardage_style = dict(figsize=(7, 7), title="Hole {hole} Layout (Yardage Aligned)", title_size=14, legend=_legend_outside,
+                      xlabel="Yards (Horizontal)", ylabel="Yards (Up the Hole)", grid=True, rect=[0, 0, 0.85, 1])
+ORIENTATIONS = {
+    "true": dict(source=catalog.GOLF_HOLES_FULL, background=True, rotate=False, filename="hole_{hole}_layout.png",
+                 figsize=(6, 6), title="Hole {hole} Layout", title_size=None, legend=dict(loc="upper right"),
+                 xlabel=None, ylabel=None, grid=False, rect=None),
+    "yardage": dict(source=catalog.GOLF_HOLES_YARDAGE, background=False, rotate=False, filename="hole_{hole}_yards.png",
+                    **_yardage_style),
+    "upward": dict(source=catalog.GOLF_HOLES_FULL, background=True, rotate=True, filename="hole_{hole}_rotated_upward.png",
+                   figsize=(6, 6), title="Hole {hole} Layout (Facing Up)", title_size=None, legend=_legend_outside,
+                   xlabel=None, ylabel=None, grid=False, rect=[0, 0, 0.85, 1]),
+    "separated": dict(source=catalog.GOLF_HOLES_YARDAGE, background=False, rotate=False,
+                      filename="hole_{hole}/hole_{hole}_layout.png", **_yardage_style),
+}
+
+
+# ----------------------------------------
+# ⛳ Per-hole features
+# ----------------------------------------
+def hole_features(orientation, source=None, holes=None):
+    """
+    Features to draw for each hole, in the orientation's coordinates.
+
+    Parameters:
+    - orientation: one of ORIENTATIONS
+    - source: course CSV with a WKT column (default: the orientation's catalog file)
+    - holes: hole numbers to include (default: every hole except 19, the OB / rough background)
+
+    Returns:
+    - dict hole → DataFrame (source columns + "geometry"); "upward" skips holes without a hole line
+    """
+    spec = ORIENTATIONS[orientation]
+    df = catalog.wkt_table(source or spec["source"])
+    if holes is None:
+        holes = sorted([int(h) for h in df["hole_ref"].dropna().unique() if int(h) != 19])
+
+    background = df[(df["hole_ref"] == 19) & (df["lie"] != "rough")]
+    frames = course_frames() if spec["rotate"] else None
+
+    features = {}
+    for hole in holes:
+        hole_df = df[df["hole_ref"] == hole]
+
+        # OB / water (hole_ref == 19) that touch this hole
+        if spec["background"]:
+            main_union = unary_union(hole_df["geometry"].tolist())
+            hole_df = pd.concat([hole_df, background[shapely.intersects(background["geometry"].values, main_union)]])
+
+        if spec["rotate"]:
+            if hole not in frames:
+                print(f"Skipping hole {hole}: no line found")
+                continue
+
+            # Rotate about the tee to face up: one precomputed affine matrix for all of the hole's vertices
+            hole_df = hole_df.copy()
+            hole_df["geometry"] = frames[hole].transform_geometries(hole_df["geometry"].to_numpy(), "world", "hole")
+
+        features[hole] = hole_df
+    return features
+
+
+def lie_layers(features):
+    """
+    Exterior rings grouped by lie, in order of first appearance (so the legend and stacking follow the rows).
+
+    Returns:
+    - list of (lie, [N×2 coordinate arrays])
+    """
+    layers = {}
+    for lie, geom in zip(features["lie"], features["geometry"]):
+        parts = geom.geoms if hasattr(geom, "geoms") else [geom]
+        layers.setdefault(lie, []).extend(np.asarray(poly.exterior.coords) for poly in parts)
+    return list(layers.items())
+
+
+# ----------------------------------------
+# 🖼️ Rendering
+# ----------------------------------------
+def render_hole(hole, layers, spec, output):
+    fig, ax = plt.subplots(figsize=spec["figsize"])
+
+    # One collection per lie: a single draw call however many polygon parts it has
+    for lie, rings in layers:
+        color = lie_colors.get(lie, "gray")
+        ax.add_collection(PolyCollection(rings, facecolors=color, edgecolors=color, alpha=0.75, label=lie))
+    ax.autoscale_view()
+
+    # Legend with white background box and no overlap
+    ax.legend(frameon=True, facecolor="white", framealpha=1, edgecolor="black", **spec["legend"])
+
+    # Title and style
+    ax.set_title(spec["title"].format(hole=hole), **({"fontsize": spec["title_size"]} if spec["title_size"] else {}))
+    if spec["xlabel"]:
+        ax.set_xlabel(spec["xlabel"])
+        ax.set_ylabel(spec["ylabel"])
+    ax.set_aspect("equal")
+    if spec["grid"]:
+        ax.grid(True, linestyle="--", alpha=0.3)
+    else:
+        ax.tick_params(left=True, bottom=True, labelleft=True, labelbottom=True)
+
+    plt.tight_layout(**({"rect": spec["rect"]} if spec["rect"] else {}))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    plt.savefig(output, dpi=300)
+    plt.close(fig)
+    return output
+
+
+def render_layouts(features, orientation, output_dir, max_workers=None):
+    """
+    Render prepared hole features (see hole_features) in parallel; returns the saved paths.
+    """
+    spec = ORIENTATIONS[orientation]
+    jobs = [(hole, lie_layers(df), spec, os.path.join(output_dir, spec["filename"].format(hole=hole)))
+            for hole, df in features.items()]
+    return parallel_map(render_hole, jobs, max_workers)
+
+
+def export_layouts(orientation, output_dir, source=None, holes=None, max_workers=None):
+    """
+    Draw every hole of a course in one orientation.
+
+    Parameters:
+    - orientation: "true", "yardage", "upward" or "separated"
+    - output_dir: folder for the PNGs ("separated" adds one sub-folder per hole)
+    - source: course CSV (default: the orientation's catalog file)
+    - holes: hole numbers (default: all but 19)
+    - max_workers: process pool size (default: one per CPU)
+
+    Returns:
+    - dict hole → drawn features (e.g. the rotated geometries for "upward")
+    """
+    features = hole_features(orientation, source, holes)
+    render_layouts(features, orientation, output_dir, max_workers)
+    return features
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Export hole layouts")
+    parser.add_argument("orientation", choices=list(ORIENTATIONS))
+    parser.add_argument("output_dir")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    args = parser.parse_args()
+
+    start = time.time()
+    export_layouts(args.orientation, args.output_dir, max_workers=args.workers)
+    print(f"✅ {args.orientation} layouts saved to {args.output_dir} in {time.time() - start:.2f}s")
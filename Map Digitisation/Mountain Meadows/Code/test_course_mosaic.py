@@ -0,0 +1,15 @@
+import numpy as np
+from PIL import Image
+
+from course_mosaic import build_mosaic
+
+
+def test_odd_sized_image_fits_its_cell(tmp_path):
+    # reduce(2) turns 101×77 into 51×39: the cell has to round up as well
+    path = tmp_path / "hole.png"
+    Image.new("RGBA", (101, 77), (0, 128, 0, 255)).save(path)
+
+    mosaic = build_mosaic([str(path), str(path)], cols=2, downsample=2)
+
+    assert mosaic.shape == (39, 2 * 51, 3)
+    assert (mosaic == np.array([0, 128, 0], dtype=np.uint8)).all()
@@ -1,11 +1,14 @@
-import pandas as pd
-from shapely import wkt
+import os
+import sys
 import matplotlib.pyplot as plt
 from shapely.geometry import Polygon, MultiPolygon
 
+# 🗂️ Shared input catalog (GPR/data_catalog.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "GPR"))
+import data_catalog as catalog
+
 # Load data
-df = pd.read_csv("MarkovChaining/try1data/hole_1_data.csv")
-df["geometry"] = df["WKT"].apply(wkt.loads)
+df = catalog.wkt_table("MarkovChaining/try1data/hole_1_data.csv")
 
 def plot_layout(df):
     fig, ax = plt.subplots(figsize=(8, 8))
@@ -1,13 +1,14 @@
 import os
-import numpy as np
-import pandas as pd
-from shapely.geometry import Point
-from shapely import wkt
 import matplotlib.pyplot as plt
+import sys
+
+# 🗺️ Rasterized lie maps (GPR/lie_raster.py) + shared input catalog (GPR/data_catalog.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "GPR"))
+from lie_raster import LieRaster
+import data_catalog as catalog
 
 # === Load hole geometry ===
-df = pd.read_csv("MarkovChaining/try1data/hole_1_data.csv")
-df["geometry"] = df["WKT"].apply(wkt.loads)
+df = catalog.wkt_table("MarkovChaining/try1data/hole_1_data.csv")   # geometry from the binary sidecar, not WKT text
 
 # Debug: check bounds
 for i, geom in enumerate(df["geometry"].head(5)):
@@ -23,29 +24,17 @@ maxy = max(b[3] for b in all_bounds)
 print("→ Geometry bounds:")
 print(f"   x: [{minx:.2f}, {maxx:.2f}], y: [{miny:.2f}, {maxy:.2f}]")
 
-# === Generate raster grid at 0.5-yard resolution ===
-x_range = np.arange(minx - 1, maxx + 1, 3.0)
-y_range = np.arange(miny - 1, maxy + 1, 3.0)
-states = []
-
-# === Assign lie type to each point ===
-for x in x_range:
-    for y in y_range:
-        pt = Point(x, y)
-        assigned = False
-        for _, row in df.iterrows():
-            if row["geometry"].contains(pt):
-                states.append({"x": x, "y": y, "lie": row["lie"]})
-                assigned = True
-                break
-        if not assigned:
-            states.append({"x": x, "y": y, "lie": "rough"})
-
-# === Save to CSV ===
-states_df = pd.DataFrame(states)
+# === Rasterize the hole's lies (GPR/lie_raster.py) ===
+# Cell centres at np.arange(min - 1, max + 1, resolution); overlaps go to the higher-priority lie
+resolution = 3.0
+raster = LieRaster.from_frame(df, resolution=resolution, margin=1)
 os.makedirs("MarkovChaining/results/try1", exist_ok=True)
+raster.save("MarkovChaining/results/try1/lie_raster")   # memory-mappable lie grid for O(1) lookups
+
+# === States are the raster's cell centres (anything outside the polygons is rough) ===
+states_df = raster.states(default="rough")
 states_df.to_csv("MarkovChaining/results/try1/states.csv", index=False)
-print(f"✅ Generated {len(states)} states. Saved to states.csv.")
+print(f"✅ Generated {len(states_df)} states. Saved to states.csv.")
 
 # === Plot classified raster grid ===
 plt.figure(figsize=(8, 8))
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from shapely.ops import unary_union
+
+# 🧮 State snapping, sparse transitions and the Bellman solver (GPR/state_space.py, transition_matrix.py,
+# value_iteration.py) + shared input catalog (GPR/data_catalog.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "GPR"))
+from course_index import CourseLieIndex
+from state_space import StateSpace
+from transition_matrix import build_transitions
+from value_iteration import putting_values, solve
+import data_catalog as catalog
+
+# === Load hole geometry, states and dispersion ===
+df = catalog.wkt_table("MarkovChaining/try1data/hole_1_data.csv")
+states = pd.read_csv("MarkovChaining/results/try1/states.csv")
+disp_df = pd.read_csv("MarkovChaining/try1data/simulated_lpga_shot_data.csv")
+putting = pd.read_csv("MarkovChaining/try1data/strokes_on_green_feet_broadie.csv")
+
+# === Pin: centre of the green farthest from the tee ===
+tee = unary_union(list(df["geometry"][df["lie"] == "tee"])).centroid
+greens = df[df["lie"] == "green"]
+hole_green = greens["geometry"].iloc[int(np.argmax([g.centroid.distance(tee) for g in greens["geometry"]]))]
+pin = (hole_green.centroid.x, hole_green.centroid.y)
+print(f"→ Pin at ({pin[0]:.1f}, {pin[1]:.1f})")
+
+# hole_1_data also holds another green near the tee; only this hole's green ends the hole
+on_green = CourseLieIndex([hole_green], ["green"]).contains(states["x"], states["y"])
+states.loc[(states["lie"] == "green") & ~on_green, "lie"] = "fairway"
+space = StateSpace(states)
+
+# === Transitions for every club × aim, aimed at the pin ===
+start = time.time()
+transitions = build_transitions(space, disp_df, target=pin)
+transitions.save("MarkovChaining/results/try1/transitions")
+print(f"✅ {len(transitions.actions)} actions over {len(space)} states "
+      f"({transitions.nbytes / 1e6:.0f} MB) in {time.time() - start:.1f}s")
+
+# === Value iteration: V(s) = 1 + min_a Σ P(s'|s,a) V(s'), putts on the green ===
+start = time.time()
+solution = solve(space, transitions, putting_values(space, pin, putting), method="gauss-seidel")
+if not solution.converged:
+    raise RuntimeError(f"Value iteration did not converge in {solution.sweeps} sweeps "
+                       f"(residual {solution.residual:.1e}); not writing states_value_updated.csv")
+print(f"✅ Solved in {solution.sweeps} sweeps ({time.time() - start:.1f}s, residual {solution.residual:.1e})")
+
+policy_df = solution.policy_frame()
+policy_df.to_csv("MarkovChaining/results/try1/states_value_updated.csv", index=False)
+solution.save("MarkovChaining/results/try1/value_raster")
+tee_states = policy_df[policy_df["lie"] == "tee"]
+best = tee_states.loc[tee_states["V"].idxmin()]
+print(f"→ From the tee: {best['V']:.2f} strokes with {best['club']} (aim {best['aim']:+g}°)")
+
+# === Plot value raster and policy ===
+fig, (ax_v, ax_p) = plt.subplots(1, 2, figsize=(12, 8))
+extent = [space.x_lines[0], space.x_lines[-1], space.y_lines[0], space.y_lines[-1]]
+image = ax_v.imshow(solution.value_raster(), origin="lower", extent=extent, cmap="viridis")
+fig.colorbar(image, ax=ax_v, label="Expected strokes")
+ax_v.set_title("Value V(s)")
+
+for club, group in policy_df.dropna(subset=["club"]).groupby("club"):
+    ax_p.scatter(group["x"], group["y"], label=club, s=2)
+ax_p.set_title("Policy: best club")
+ax_p.legend(markerscale=5, fontsize=7)
+for ax in (ax_v, ax_p):
+    for geom in df["geometry"]:
+        for part in getattr(geom, "geoms", [geom]):
+            ax.plot(*part.exterior.xy, color="black", linewidth=0.5)
+    ax.set_aspect("equal")
+plt.tight_layout()
+plt.savefig("MarkovChaining/results/try1/policy_visualisation.png", dpi=150)
+plt.show()
@@ -1,16 +1,27 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from shapely.geometry import Point, Polygon, MultiPolygon
-from shapely import wkt
+from shapely.geometry import Polygon, MultiPolygon
 from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.colors as mcolors
 import os
+import sys
+
+# 🤖 From-scratch 2D grid GP (GPR/gp_grid.py) + vectorised lie lookup (GPR/course_index.py) + input catalog
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "GPR"))
+from gp_grid import GridGPModel
+from course_index import CourseLieIndex
+import data_catalog as catalog
+
+# === Green surface source ===
+# None → hand-written green_contour on the hole 9 green
+# CSV of measured (x, y, height) points on a regular lattice → 2D grid GP fitted to them
+measured_green_file = None   # e.g. "example_green.csv"
 
 # === Load green polygon data ===
-df = pd.read_csv("PART 1/Map Digitisation/Mountain Meadows/MountainMeadows_Separated/hole_9/hole_9_data.csv")
+df = catalog.wkt_table("PART 1/Map Digitisation/Mountain Meadows/MountainMeadows_Separated/hole_9/hole_9_data.csv")
 green_info = df[df["lie"] == "green"].iloc[0]
-green_polygon = wkt.loads(green_info["WKT"])
+green_polygon = green_info["geometry"]
 
 # Handle both Polygon and MultiPolygon types
 if isinstance(green_polygon, Polygon):
@@ -41,22 +52,48 @@ def green_contour(x, y):
 
     return curved_tier + upper_left + lower_right + tilt
 
-# === Generate 2D grid over green bounds ===
-minx, miny, maxx, maxy = green_shape.bounds
-x_vals = np.linspace(minx, maxx, 300)
-y_vals = np.linspace(miny, maxy, 300)
-X, Y = np.meshgrid(x_vals, y_vals)
+if measured_green_file is None:
+    # === Generate 2D grid over green bounds ===
+    minx, miny, maxx, maxy = green_shape.bounds
+    x_vals = np.linspace(minx, maxx, 300)
+    y_vals = np.linspace(miny, maxy, 300)
+    X, Y = np.meshgrid(x_vals, y_vals)
 
-# Create mask to restrict calculations to the green area
-points = np.column_stack((X.ravel(), Y.ravel()))
-mask = np.array([green_shape.contains(Point(x, y)) for x, y in points]).reshape(X.shape)
+    # Create mask to restrict calculations to the green area (one vectorised lookup for all 90k points)
+    mask = CourseLieIndex([green_shape], ["green"]).contains(X, Y)
 
-# Compute green elevation
-Z = green_contour(X, Y)
-Z[~mask] = np.nan  # mask out non-green area
+    # Compute green elevation
+    Z = green_contour(X, Y)
+    Z[~mask] = np.nan  # mask out non-green area
 
-# Pin location
-pin_x, pin_y = -3.6, 177
+    # Pin location
+    pin_x, pin_y = -3.6, 177
+else:
+    # === Fit the measured points and predict height + slope on a 300 x 300 grid ===
+    measured = pd.read_csv(measured_green_file)
+    surface = GridGPModel.from_points(measured["x"], measured["y"], measured["height"])
+    minx, miny, maxx, maxy = measured["x"].min(), measured["y"].min(), measured["x"].max(), measured["y"].max()
+    x_vals = np.linspace(minx, maxx, 300)
+    y_vals = np.linspace(miny, maxy, 300)
+    X, Y = np.meshgrid(x_vals, y_vals)
+    mask = np.ones(X.shape, dtype=bool)  # the measured lattice covers the whole green
+
+    Z, Z_var = surface.predict(x_vals, y_vals)
+    dx, dy = surface.gradient(x_vals, y_vals, return_var=False)  # analytic slopes, no finite differences
+
+    # Pin location (centre of the measured green)
+    pin_x, pin_y = (minx + maxx) / 2, (miny + maxy) / 2
+
+    # === Height uncertainty ===
+    plt.figure(figsize=(8, 6))
+    cp = plt.contourf(X, Y, np.sqrt(Z_var), levels=50, cmap="viridis")
+    plt.colorbar(cp, label="Height SD")
+    plt.scatter(measured["x"], measured["y"], s=0.2, color="white", alpha=0.3)
+    plt.title(f"Measured Green Surface Uncertainty (length scale {surface.lam:.2f})")
+    plt.xlabel("x")
+    plt.ylabel("y")
+    plt.axis('equal')
+    plt.tight_layout()
 
 # === 3D Surface Plot ===
 fig = plt.figure(figsize=(10, 6))
@@ -78,7 +115,8 @@ plt.plot(pin_x, pin_y, marker='*', color='red', markersize=12, alpha=0.9)
 plt.tight_layout()
 
 # === Slope % Calculation ===
-dy, dx = np.gradient(Z, y_vals, x_vals)
+if measured_green_file is None:
+    dy, dx = np.gradient(Z, y_vals, x_vals)
 slope_percent = np.sqrt(dx**2 + dy**2) * 100
 slope_percent[~mask] = np.nan
 